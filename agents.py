@@ -7,7 +7,7 @@ import json
 from typing import Dict, List, Any, Generator, Optional, Tuple, Set
 from openai import OpenAI, AsyncOpenAI
 from utils import get_openai_api_key, extract_entities, parse_agent_citations
-from intent_router import IntentRouter, IntentRouterError, MentionParser
+from intent_router import IntentRouter, IntentRouterError
 from web_search import get_web_search_tool
 import asyncio
 import threading  # FIX: Added for log_buffer thread safety
@@ -45,11 +45,26 @@ AGENTS = {
     }
 }
 
+# Intent routing is a short classification call: run it on a small, fast model at
+# temperature 0 regardless of the model chosen for agent responses
+ROUTER_MODEL = os.getenv('ROUTER_MODEL', 'gpt-4o-mini')
+ROUTER_CONFIG = {
+    'temperature': 0,
+    'max_tokens': 512,  # Bounds routing output (a batch of 8 compact decisions fits)
+}
+
 
 class OpenAIClient:
     """Wrapper for OpenAI API - supports GPT-5, GPT-4o, and o1 reasoning models"""
 
-    def __init__(self, use_gpt5=False, reasoning_model=None):
+    def __init__(self, use_gpt5=False, reasoning_model=None, model=None, config=None):
+        """
+        Args:
+            use_gpt5: Use GPT-5 through the Responses API
+            reasoning_model: 'o1-preview' or 'o1-mini' to use an o1 reasoning model
+            model: Chat Completions model to use instead of gpt-4o (e.g. 'gpt-4o-mini')
+            config: Overrides merged into the model's default request config
+        """
         # ALWAYS use async client for better concurrency - works with all models!
         self.async_client = AsyncOpenAI(api_key=get_openai_api_key())
         # Keep sync client ONLY for backward compatibility (will phase out)
@@ -73,84 +88,151 @@ class OpenAIClient:
             }
         else:
             # GPT-4o: Chat Completions API (default, works immediately)
-            self.model = 'gpt-4o'
+            self.model = model or 'gpt-4o'
             self.config = {
                 'temperature': 0.7,
                 'max_tokens': 2048,
             }
 
+        if config:
+            self.config = {**self.config, **config}
+
         # Log which model is active
         print(f"🤖 [AI Model] Initialized: {self.model}")
 
-    def generate(self, messages: List[Dict[str, str]], stream: bool = True) -> Generator[str, None, None]:
-        """Generate response with optional streaming"""
-        try:
-            if self.reasoning_model:
-                # o1 reasoning models: No streaming, convert system messages to user
-                print(f"\n🧠 [REASONING MODEL] Using {self.reasoning_model} for deep analysis...", flush=True)
-
-                # Convert system messages to user messages (o1 doesn't support system role)
-                processed_messages = []
-                for msg in messages:
-                    if msg['role'] == 'system':
-                        processed_messages.append({
-                            'role': 'user',
-                            'content': f"[System Instructions]\n{msg['content']}"
-                        })
-                    else:
-                        processed_messages.append(msg)
-
-                # o1 models don't support streaming
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=processed_messages,
-                    **self.config
-                )
-
-                # Return full response at once
-                content = response.choices[0].message.content
-                yield content
-
-                # Log thinking tokens if available
-                if hasattr(response.usage, 'completion_tokens_details'):
-                    reasoning_tokens = response.usage.completion_tokens_details.get('reasoning_tokens', 0)
-                    if reasoning_tokens > 0:
-                        print(f"    💭 Reasoning tokens used: {reasoning_tokens}", flush=True)
-
-            elif self.use_gpt5:
-                # GPT-5: Responses API (non-streaming until organization verified)
-                input_text = self._messages_to_input(messages)
-                # Always use stream=False until organization is verified
-                response = self.client.responses.create(
-                    model=self.model,
-                    input=input_text,
-                    stream=False,  # Disabled until OpenAI organization is verified
-                    **self.config
-                )
+    def generate(
+        self,
+        messages: List[Dict[str, str]],
+        stream: bool = True,
+        response_format: Optional[Dict[str, Any]] = None
+    ) -> Generator[str, None, None]:
+        """
+        Generate response with optional streaming
 
-                # Non-streaming response - yield full response at once
-                yield response.output_text
-            else:
-                # GPT-4o: Chat Completions API
+        Args:
+            messages: Chat messages
+            stream: Stream tokens where the model supports it
+            response_format: Optional Chat Completions json_schema response format
+                (structured output); ignored by o1 models
+        """
+        try:
+            if stream and not self.reasoning_model and not self.use_gpt5:
+                # GPT-4o: Chat Completions API (streaming)
                 response = self.client.chat.completions.create(
                     model=self.model,
                     messages=messages,
-                    stream=stream,
-                    **self.config
+                    stream=True,
+                    **self._request_config(response_format)
                 )
 
-                if stream:
+                try:
                     for chunk in response:
                         if chunk.choices[0].delta.content:
                             yield chunk.choices[0].delta.content
-                else:
-                    yield response.choices[0].message.content
+                finally:
+                    # Also runs when the caller closes this generator early, so the HTTP
+                    # stream is released and the server stops generating tokens
+                    response.close()
+            else:
+                # o1 and GPT-5 never stream - yield the full response at once
+                yield self._complete(messages, response_format)
 
         except Exception as e:
             print(f"Error generating response: {e}", flush=True)
             yield f"[Error: {str(e)}]"
 
-    async def generate_async(self, messages: List[Dict[str, str]]) -> str:
+    def generate_full(
+        self,
+        messages: List[Dict[str, str]],
+        response_format: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Generate a complete response as one string (single non-streaming call, no generator)"""
+        try:
+            return self._complete(messages, response_format)
+        except Exception as e:
+            print(f"Error generating response: {e}", flush=True)
+            return f"[Error: {str(e)}]"
+
+    def _request_config(self, response_format: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Model config for an API call, plus structured output if requested
+
+        Chat Completions takes response_format as is; the GPT-5 Responses API takes
+        the same schema as text.format (alongside its verbosity setting). o1 models
+        don't support it, so they get the plain config.
+        """
+        if response_format is None or self.reasoning_model:
+            return self.config
+        if self.use_gpt5:
+            text = {**self.config.get('text', {}), 'format': {'type': 'json_schema', **response_format['json_schema']}}
+            return {**self.config, 'text': text}
+        return {**self.config, 'response_format': response_format}
+
+    def _complete(
+        self,
+        messages: List[Dict[str, str]],
+        response_format: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Non-streaming completion for the active model (raises on API errors)"""
+        if self.reasoning_model:
+            # o1 reasoning models: No streaming, convert system messages to user
+            print(f"\n🧠 [REASONING MODEL] Using {self.reasoning_model} for deep analysis...", flush=True)
+
+            # Convert system messages to user messages (o1 doesn't support system role)
+            processed_messages = []
+            for msg in messages:
+                if msg['role'] == 'system':
+                    processed_messages.append({
+                        'role': 'user',
+                        'content': f"[System Instructions]\n{msg['content']}"
+                    })
+                else:
+                    processed_messages.append(msg)
+
+            # o1 models don't support streaming
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=processed_messages,
+                **self.config
+            )
+
+            # Log thinking tokens if available
+            if hasattr(response.usage, 'completion_tokens_details'):
+                reasoning_tokens = response.usage.completion_tokens_details.get('reasoning_tokens', 0)
+                if reasoning_tokens > 0:
+                    print(f"    💭 Reasoning tokens used: {reasoning_tokens}", flush=True)
+
+            # Return full response at once
+            return response.choices[0].message.content
+
+        elif self.use_gpt5:
+            # GPT-5: Responses API (non-streaming until organization verified)
+            input_text = self._messages_to_input(messages)
+            # Always use stream=False until organization is verified
+            response = self.client.responses.create(
+                model=self.model,
+                input=input_text,
+                stream=False,  # Disabled until OpenAI organization is verified
+                **self._request_config(response_format)
+            )
+
+            # Non-streaming response - full response at once
+            return response.output_text
+        else:
+            # GPT-4o: Chat Completions API
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                stream=False,
+                **self._request_config(response_format)
+            )
+            return response.choices[0].message.content
+
+    async def generate_async(
+        self,
+        messages: List[Dict[str, str]],
+        response_format: Optional[Dict[str, Any]] = None
+    ) -> str:
         """Fully async generation for ALL models - no blocking, no threads!"""
         try:
             if self.reasoning_model:
@@ -188,7 +270,7 @@ class OpenAIClient:
                     model=self.model,
                     input=input_text,
                     stream=False,  # Disabled until OpenAI organization is verified
-                    **self.config
+                    **self._request_config(response_format)
                 )
 
                 print(f"✅ [GPT-5] Response generated successfully", flush=True)
@@ -202,7 +284,7 @@ class OpenAIClient:
                     model=self.model,
                     messages=messages,
                     stream=False,
-                    **self.config
+                    **self._request_config(response_format)
                 )
 
                 print(f"✅ [{self.model}] Response generated successfully (pure async)", flush=True)
@@ -708,8 +790,7 @@ Respond with ONLY a JSON array: ["rahil", "agent2", "agent3"]"""
         ]
         
         try:
-            response = self.openai_client.generate(messages, stream=False)
-            response_text = next(response)
+            response_text = self.openai_client.generate_full(messages)
             
             # Extract JSON from response
             import re
@@ -809,6 +890,71 @@ class ConferenceOrchestrator(Orchestrator):
             })
 
 
+class SpeculativeResponse:
+    """
+    One agent answer started on the router's top guess while routing runs
+
+    Launched through IntentRouter.route_user_query_speculative. The answer is
+    only used if routing picks that agent and the routed call would send exactly
+    the same messages; otherwise it is discarded.
+    """
+
+    def __init__(self, agents: Dict[str, 'Agent'], user_query: str, conversation_history: List[Dict[str, str]]):
+        self.agents = agents
+        self.user_query = user_query
+        self.conversation_history = conversation_history
+        self.agent_id: Optional[str] = None
+        self._messages: Optional[List[Dict[str, str]]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def launch(self, agent_id: str) -> 'asyncio.Task':
+        """Start agent_id's answer (the launch_agent_fn for route_user_query_speculative)"""
+        agent = self.agents[agent_id]
+        self.agent_id = agent_id
+        self._messages = agent.build_messages(
+            self.user_query, self.conversation_history, mode="group", routing_context="expertise_match"
+        )
+        self._task = asyncio.ensure_future(agent.openai_client.generate_async(self._messages))
+        return self._task
+
+    async def take(self, agent_id: str, messages: List[Dict[str, str]]) -> Optional[str]:
+        """
+        Get the speculative answer for a routed call
+
+        Args:
+            agent_id: Agent about to respond
+            messages: Messages the routed call would send
+
+        Returns:
+            The answer if it was started for this agent with these messages,
+            else None (and the speculative call is discarded)
+        """
+        if self._task is None:
+            return None
+        if agent_id != self.agent_id or messages != self._messages or self._task.cancelled():
+            self.discard()
+            return None
+        task, self._task = self._task, None
+        return await task
+
+    def discard(self):
+        """
+        Cancel the speculative call if still running
+
+        A call that already finished can't be cancelled, so its result or
+        exception is retrieved instead; otherwise asyncio logs "Task exception
+        was never retrieved" when it is garbage collected.
+        """
+        task, self._task = self._task, None
+        if task is None:
+            return
+        if task.done():
+            if not task.cancelled():
+                task.exception()
+        else:
+            task.cancel()
+
+
 class MultiAgentSystem:
     """Main system coordinating all agents"""
 
@@ -821,7 +967,9 @@ class MultiAgentSystem:
         }
         self.orchestrator = Orchestrator(self.agents, self.openai_client)
         self.conference_orchestrator = ConferenceOrchestrator(self.agents, self.openai_client)
-        self.intent_router = IntentRouter(self.openai_client)
+        # Routing gets its own small-model client (kept when the response model is switched)
+        self.router_client = OpenAIClient(model=ROUTER_MODEL, config=ROUTER_CONFIG)
+        self.intent_router = IntentRouter(self.router_client)
         self.max_agent_to_agent_rounds = 2  # Prevent infinite loops
 
         # Log streaming support (buffered logs that server.py will emit)
@@ -847,10 +995,9 @@ class MultiAgentSystem:
         for agent in self.agents.values():
             agent.openai_client = self.openai_client
 
-        # Update orchestrators and router
+        # Update orchestrators (the intent router keeps its own ROUTER_MODEL client)
         self.orchestrator.openai_client = self.openai_client
         self.conference_orchestrator.openai_client = self.openai_client
-        self.intent_router.openai_client = self.openai_client
 
         print(f"✅ Model switched to: {self.openai_client.model}")
 
@@ -1047,41 +1194,32 @@ class MultiAgentSystem:
                 # ✅ ENABLED: Agent-to-agent routing with STRICT passive vs active detection
                 # Only routes for explicit delegation/questions, ignores passive mentions
                 try:
-                    # Quick pre-check with MentionParser
-                    print(f"\n🔍 [{agent_id}] Checking for @mentions in response...", flush=True)
-                    print(f"    MentionParser.has_mentions() = {MentionParser.has_mentions(full_response)}", flush=True)
-
-                    has_mentions = MentionParser.has_mentions(full_response)
-
-                    if has_mentions:
-                        # Extract mentions for debugging
-                        extracted_mentions = MentionParser.extract_mentions(full_response)
-                        print(f"    Extracted mentions: {extracted_mentions}", flush=True)
-
-                        # Use LLM to analyze mentions and route (STRICT passive vs active detection)
-                        mention_routing = self.intent_router.route_agent_response(
-                            agent_id,
-                            full_response
-                        )
+                    # route_agent_response pre-scans for mentions, questions to a teammate
+                    # and delegation language itself; the LLM only runs when one is found
+                    print(f"\n🔍 [{agent_id}] Checking response for handoffs...", flush=True)
+
+                    # Use LLM to analyze mentions and route (STRICT passive vs active detection)
+                    mention_routing = self.intent_router.route_agent_response(
+                        agent_id,
+                        full_response
+                    )
 
-                        print(f"    LLM routing result: {mention_routing.agent_ids}", flush=True)
-                        print(f"    Reasoning: {mention_routing.reasoning}", flush=True)
+                    print(f"    LLM routing result: {mention_routing.agent_ids}", flush=True)
+                    print(f"    Reasoning: {mention_routing.reasoning}", flush=True)
 
-                        # Add mentioned agents to queue (if not already responded and not already in queue)
-                        newly_added = []
-                        for mentioned_agent_id in mention_routing.agent_ids:
-                            if mentioned_agent_id not in responded_agents and mentioned_agent_id not in agent_queue:
-                                agent_queue.append(mentioned_agent_id)
-                                newly_added.append(mentioned_agent_id)
+                    # Add mentioned agents to queue (if not already responded and not already in queue)
+                    newly_added = []
+                    for mentioned_agent_id in mention_routing.agent_ids:
+                        if mentioned_agent_id not in responded_agents and mentioned_agent_id not in agent_queue:
+                            agent_queue.append(mentioned_agent_id)
+                            newly_added.append(mentioned_agent_id)
 
-                        if newly_added:
-                            print(f"    ✅ Added {newly_added} to agent queue", flush=True)
-                            # Increment round counter only when we actually add new agents
-                            agent_to_agent_round += 1
-                        else:
-                            print(f"    ⏭️ No new agents to add (all already responded or queued)", flush=True)
+                    if newly_added:
+                        print(f"    ✅ Added {newly_added} to agent queue", flush=True)
+                        # Increment round counter only when we actually add new agents
+                        agent_to_agent_round += 1
                     else:
-                        print(f"    No @mentions detected in response", flush=True)
+                        print(f"    ⏭️ No new agents to add (all already responded or queued)", flush=True)
 
                 except IntentRouterError as e:
                     # Log error but continue (agent-to-agent routing is optional)
@@ -1115,11 +1253,12 @@ class MultiAgentSystem:
             List of (agent_id, full_response) tuples
         """
         local_history = conversation_history.copy() if conversation_history else []
+        speculation = SpeculativeResponse(self.agents, user_query, local_history)
 
         try:
             # Log: Intent analysis starting
             if websocket and log_streamer:
-                routing_model = self.openai_client.model if hasattr(self.openai_client, 'model') else 'gpt-4o'
+                routing_model = self.router_client.model
                 await log_streamer.emit(
                     websocket,
                     level="info",
@@ -1131,10 +1270,18 @@ class MultiAgentSystem:
                     }
                 )
 
-            # Tier 1: Route user query to appropriate agents
-            routing_decision = self.intent_router.route_user_query(user_query, local_history)
+            # Tier 1: Route user query to appropriate agents (batched with concurrent sessions,
+            # without blocking the event loop). The likeliest agent starts answering while the
+            # router runs (see SpeculativeResponse)
+            routing_decision, _ = await self.intent_router.route_user_query_speculative(
+                user_query, local_history, speculation.launch
+            )
             agent_queue = routing_decision.agent_ids.copy()
 
+            # Only the first agent answers from the history the speculation was built on
+            if speculation.agent_id not in agent_queue[:1]:
+                speculation.discard()
+
             # Log: Intent detected
             if websocket and log_streamer:
                 intent_emoji_map = {
@@ -1263,13 +1410,20 @@ class MultiAgentSystem:
                             metadata=log.get("metadata")
                         )
 
-                # Generate response using async method (non-blocking!)
-                full_response = await agent.respond_async(
-                    user_query,
-                    local_history,
-                    mode="group",
-                    routing_context=routing_decision.context
-                )
+                # Generate response using async method (non-blocking!), reusing the
+                # speculative answer if it was built from the same messages
+                full_response = await speculation.take(agent_id, agent.build_messages(
+                    user_query, local_history, mode="group", routing_context=routing_decision.context
+                ))
+                if full_response is not None:
+                    print(f"    ⚡ [{agent_id}] Using speculative response", flush=True)
+                else:
+                    full_response = await agent.respond_async(
+                        user_query,
+                        local_history,
+                        mode="group",
+                        routing_context=routing_decision.context
+                    )
 
                 print(f"✅ [{agent_id}] Response generated: {full_response[:100]}...", flush=True)
 
@@ -1312,36 +1466,28 @@ class MultiAgentSystem:
 
                 # Check for @mentions (Tier 2 routing)
                 try:
-                    print(f"\n🔍 [{agent_id}] Checking for @mentions in response...", flush=True)
-                    has_mentions = MentionParser.has_mentions(full_response)
-                    print(f"    MentionParser.has_mentions() = {has_mentions}", flush=True)
-
-                    if has_mentions:
-                        extracted_mentions = MentionParser.extract_mentions(full_response)
-                        print(f"    Extracted mentions: {extracted_mentions}", flush=True)
-
-                        mention_routing = self.intent_router.route_agent_response(
-                            agent_id,
-                            full_response
-                        )
+                    # Pre-scanned inside the router; the LLM only runs for a possible handoff
+                    print(f"\n🔍 [{agent_id}] Checking response for handoffs...", flush=True)
+                    mention_routing = await self.intent_router.route_agent_response_async(
+                        agent_id,
+                        full_response
+                    )
 
-                        print(f"    LLM routing result: {mention_routing.agent_ids}", flush=True)
-                        print(f"    Reasoning: {mention_routing.reasoning}", flush=True)
+                    print(f"    LLM routing result: {mention_routing.agent_ids}", flush=True)
+                    print(f"    Reasoning: {mention_routing.reasoning}", flush=True)
 
-                        # Add mentioned agents to queue
-                        newly_added = []
-                        for mentioned_agent_id in mention_routing.agent_ids:
-                            if mentioned_agent_id not in responded_agents and mentioned_agent_id not in agent_queue:
-                                agent_queue.append(mentioned_agent_id)
-                                newly_added.append(mentioned_agent_id)
+                    # Add mentioned agents to queue
+                    newly_added = []
+                    for mentioned_agent_id in mention_routing.agent_ids:
+                        if mentioned_agent_id not in responded_agents and mentioned_agent_id not in agent_queue:
+                            agent_queue.append(mentioned_agent_id)
+                            newly_added.append(mentioned_agent_id)
 
-                        if newly_added:
-                            print(f"    ✅ Added {newly_added} to agent queue", flush=True)
-                            agent_to_agent_round += 1
-                        else:
-                            print(f"    ⏭️ No new agents to add (all already responded or queued)", flush=True)
+                    if newly_added:
+                        print(f"    ✅ Added {newly_added} to agent queue", flush=True)
+                        agent_to_agent_round += 1
                     else:
-                        print(f"    ⏭️ No @mentions detected", flush=True)
+                        print(f"    ⏭️ No new agents to add (all already responded or queued)", flush=True)
 
                 except IntentRouterError as e:
                     print(f"❌ Warning: Agent-to-agent routing failed for {agent_id}: {e}", flush=True)
@@ -1366,6 +1512,11 @@ class MultiAgentSystem:
             print(f"❌ {error_msg}", flush=True)
             raise
 
+        finally:
+            # Never leave the speculative call running, or its error unretrieved, when
+            # routing, logging or a reply fails partway through
+            speculation.discard()
+
     def think_tank_mode(
         self,
         user_query: str,
@@ -1511,16 +1662,15 @@ class MultiAgentSystem:
                             "citations": citations
                         }))
 
-                    # Check for @mentions to add more agents
-                    if MentionParser.has_mentions(full_response):
-                        try:
-                            mention_routing = self.intent_router.route_agent_response(agent_id, full_response)
-                            for mentioned_agent_id in mention_routing.agent_ids:
-                                if mentioned_agent_id not in responded_agents_this_round and mentioned_agent_id not in agent_queue:
-                                    agent_queue.append(mentioned_agent_id)
-                                    print(f"    ✅ Added {mentioned_agent_id} via @mention", flush=True)
-                        except Exception as e:
-                            print(f"    ⚠️ Mention routing failed: {e}", flush=True)
+                    # Check for handoffs (@mentions, questions, delegation) to add more agents
+                    try:
+                        mention_routing = self.intent_router.route_agent_response(agent_id, full_response)
+                        for mentioned_agent_id in mention_routing.agent_ids:
+                            if mentioned_agent_id not in responded_agents_this_round and mentioned_agent_id not in agent_queue:
+                                agent_queue.append(mentioned_agent_id)
+                                print(f"    ✅ Added {mentioned_agent_id} via @mention", flush=True)
+                    except Exception as e:
+                        print(f"    ⚠️ Mention routing failed: {e}", flush=True)
 
                 # Store round responses for consensus analysis
                 all_round_responses.append({
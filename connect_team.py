@@ -6,39 +6,67 @@ Connect team members in the knowledge graph by creating edges between:
 """
 import json
 import os
-from collections import defaultdict
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from itertools import combinations
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Load all knowledge graphs
 kg_dir = "data/knowledgeGraphs"
 people = ['mathew', 'rahil', 'shreyas', 'siddarth']
-graphs = {}
 
-for person in people:
+
+def load_graph(person):
     filepath = os.path.join(kg_dir, f"{person}_knowledge_graph.json")
-    with open(filepath, 'r') as f:
-        graphs[person] = json.load(f)
-    print(f"Loaded {person}: {len(graphs[person]['nodes'])} nodes, {len(graphs[person]['edges'])} edges")
+    # Read each file in one shot and parse the bytes directly (orjson if available)
+    with open(filepath, 'rb') as f:
+        raw = f.read()
+    graph = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    return person, graph
 
-# Find all person nodes
-person_nodes = {}
+
+# Read the graph files concurrently; the dicts keep the original person order
+with ThreadPoolExecutor(max_workers=len(people)) as executor:
+    graphs = dict(executor.map(load_graph, people))
+
+for person, graph in graphs.items():
+    print(f"Loaded {person}: {len(graph['nodes'])} nodes, {len(graph['edges'])} edges")
+
+# Index nodes by type in a single pass per graph
+nodes_by_type = {}
 for person, graph in graphs.items():
+    idx = {}
     for node in graph['nodes']:
-        if node['type'] == 'person':
-            person_nodes[person] = node['id']
-            break
+        idx.setdefault(node['type'], []).append(node)
+    nodes_by_type[person] = idx
+
+# Find all person nodes
+person_nodes = {}
+for person, idx in nodes_by_type.items():
+    if 'person' in idx:
+        person_nodes[person] = idx['person'][0]['id']
 
 print(f"\nPerson nodes: {person_nodes}")
 
 # Find shared nodes by name and type
-shared_nodes = defaultdict(lambda: defaultdict(list))  # {(name, type): {person: [node_ids]}}
+shared_nodes = {}  # {(name, type): {person: [node_ids]}}
+normalized_names = {}  # raw name -> interned normalized name, so each distinct name is normalized once
 
-for person, graph in graphs.items():
-    for node in graph['nodes']:
-        node_type = node['type']
-        name = node['properties'].get('name', '').lower().strip()
-        
-        if name and node_type in ['skill', 'technology', 'company', 'education']:
-            shared_nodes[(name, node_type)][person].append(node['id'])
+for person, idx in nodes_by_type.items():
+    for node_type in ('skill', 'technology', 'company', 'education'):
+        for node in idx.get(node_type, ()):
+            raw_name = node['properties'].get('name', '')
+            name = normalized_names.get(raw_name)
+            if name is None:
+                # Intern normalized names so repeated keys hash/compare by identity
+                name = normalized_names[raw_name] = sys.intern(raw_name.lower().strip())
+            
+            if name:
+                shared_nodes.setdefault((name, node_type), {}).setdefault(person, []).append(node['id'])
 
 # Find actually shared items (present in 2+ people)
 truly_shared = {}
@@ -56,87 +84,106 @@ new_edges_count = {}
 for person in people:
     new_edges_count[person] = 0
 
+# Index existing edges once per graph so duplicate checks are O(1)
+edge_keys = {}
+edge_ids = {}
+for person, graph in graphs.items():
+    edge_keys[person] = {(e['source'], e['target'], e['type']) for e in graph['edges']}
+    edge_ids[person] = {e['id'] for e in graph['edges']}
+
 # 1. Connect all person nodes to each other as colleagues
+def build_colleague_edge(person, other_person):
+    return {
+        "id": f"colleague_{person}_{other_person}",
+        "source": person_nodes[person],
+        "target": person_nodes[other_person],
+        "type": "colleague",
+        "properties": {
+            "relationship": "Team Member",
+            "organization": "University of Washington - iSchool",
+            "note": "Part of the same team"
+        }
+    }
+
 print("\n\nAdding colleague relationships...")
 for person, graph in graphs.items():
     person_node_id = person_nodes[person]
     
-    for other_person, other_node_id in person_nodes.items():
-        if person != other_person:
-            # Add colleague edge
-            new_edge = {
-                "id": f"colleague_{person}_{other_person}",
-                "source": person_node_id,
-                "target": other_node_id,
-                "type": "colleague",
-                "properties": {
-                    "relationship": "Team Member",
-                    "organization": "University of Washington - iSchool",
-                    "note": "Part of the same team"
-                }
-            }
-            
-            # Check if edge already exists
-            edge_exists = any(
-                e['source'] == new_edge['source'] and 
-                e['target'] == new_edge['target'] and 
-                e['type'] == new_edge['type']
-                for e in graph['edges']
-            )
-            
-            if not edge_exists:
-                graph['edges'].append(new_edge)
-                new_edges_count[person] += 1
-                print(f"  Added: {person} -> {other_person}")
+    # Desired colleague pairs minus those already present, appended in one batch
+    existing = {(src, tgt) for src, tgt, etype in edge_keys[person] if etype == 'colleague'}
+    missing = [
+        other_person for other_person, other_node_id in person_nodes.items()
+        if other_person != person and (person_node_id, other_node_id) not in existing
+    ]
+    new_edges = [build_colleague_edge(person, other_person) for other_person in missing]
+    
+    graph['edges'].extend(new_edges)
+    edge_keys[person].update((e['source'], e['target'], e['type']) for e in new_edges)
+    edge_ids[person].update(e['id'] for e in new_edges)
+    new_edges_count[person] += len(new_edges)
+    
+    if missing:
+        print(f"  Added: {person} -> {', '.join(missing)}")
 
 # 2. Create "shared_skill" edges between people through shared skills
 print("\nAdding shared skill connections...")
+# Per-person edge list and dedup indexes, resolved once for the pair loop
+edge_state = {person: (graphs[person]['edges'], edge_ids[person], edge_keys[person]) for person in graphs}
 for (name, node_type), people_dict in truly_shared.items():
     if node_type in ['skill', 'technology'] and len(people_dict) >= 2:
         people_list = list(people_dict.keys())
+        # Loop-invariant pieces of the edge ID/type, computed once per shared item
+        slug = name[:20].replace(' ', '_')
+        edge_type = f"shared_{node_type}"
         
         # For each pair of people who share this skill
-        for i, person1 in enumerate(people_list):
-            for person2 in people_list[i+1:]:
-                # Get the skill node IDs
-                skill_nodes_1 = people_dict[person1]
-                skill_nodes_2 = people_dict[person2]
-                
-                # Add edge from person1's skill to person2's person node
-                for skill_node in skill_nodes_1[:1]:  # Just use first one
-                    new_edge = {
-                        "id": f"shared_{node_type}_{person1}_{person2}_{name[:20].replace(' ', '_')}",
-                        "source": skill_node,
-                        "target": person_nodes[person2],
-                        "type": f"shared_{node_type}",
-                        "properties": {
-                            "sharedWith": person2,
-                            "skillName": name
-                        }
+        for person1, person2 in combinations(people_list, 2):
+            edge_id = f"{edge_type}_{person1}_{person2}_{slug}"
+            edges1, ids1, keys1 = edge_state[person1]
+            
+            if edge_id not in ids1:
+                # Add edge from person1's skill to person2's person node (just use first skill node)
+                skill_node = people_dict[person1][0]
+                target = person_nodes[person2]
+                edges1.append({
+                    "id": edge_id,
+                    "source": skill_node,
+                    "target": target,
+                    "type": edge_type,
+                    "properties": {
+                        "sharedWith": person2,
+                        "skillName": name
                     }
-                    
-                    edge_exists = any(
-                        e['id'] == new_edge['id']
-                        for e in graphs[person1]['edges']
-                    )
-                    
-                    if not edge_exists:
-                        graphs[person1]['edges'].append(new_edge)
-                        new_edges_count[person1] += 1
+                })
+                ids1.add(edge_id)
+                keys1.add((skill_node, target, edge_type))
+                new_edges_count[person1] += 1
 
 # Save updated graphs
-print("\n\nSaving updated knowledge graphs...")
-for person, graph in graphs.items():
+def save_graph(person):
+    graph = graphs[person]
     filepath = os.path.join(kg_dir, f"{person}_knowledge_graph.json")
     
     # Update metadata
-    graph['metadata']['nodeCount'] = len(graph['nodes'])
-    graph['metadata']['edgeCount'] = len(graph['edges'])
+    counts = {'nodeCount': len(graph['nodes']), 'edgeCount': len(graph['edges'])}
     
-    with open(filepath, 'w') as f:
-        json.dump(graph, f, indent=2)
+    # Skip rewriting graphs that gained no edges and whose counts are already current
+    if new_edges_count[person] == 0 and all(graph['metadata'].get(key) == value for key, value in counts.items()):
+        return False
     
-    print(f"✅ {person}: Added {new_edges_count[person]} new edges (total: {len(graph['edges'])} edges)")
+    graph['metadata'].update(counts)
+    with open(filepath, 'wb') as f:
+        f.write(json.dumps(graph, indent=2).encode())
+    return True
+
+
+print("\n\nSaving updated knowledge graphs...")
+with ThreadPoolExecutor(max_workers=len(people)) as executor:
+    written = dict(zip(graphs, executor.map(save_graph, graphs)))
+
+for person, graph in graphs.items():
+    status = "" if written[person] else " - unchanged, not rewritten"
+    print(f"✅ {person}: Added {new_edges_count[person]} new edges (total: {len(graph['edges'])} edges){status}")
 
 print("\n✨ Team members are now connected!")
 print("\nRestart the app to see the changes:")
@@ -5,28 +5,94 @@ FIX: Converted to use asyncio.Lock for proper async/await compatibility
 """
 import time
 import uuid
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass, field
-from collections import defaultdict
+from itertools import islice
+from typing import Deque, Dict, List, Any, Optional
+from collections import OrderedDict, defaultdict, deque
 import asyncio
 
+# Hard cap on retained messages per session (oldest are evicted first)
+MAX_SESSION_MESSAGES = 1000
+
+
+def _message_buffer() -> Deque[Dict[str, Any]]:
+    """Bounded message buffer used for session history"""
+    return deque(maxlen=MAX_SESSION_MESSAGES)
+
 
-@dataclass
 class ConversationSession:
-    """Represents a single conversation session"""
-    session_id: str
-    messages: List[Dict[str, Any]] = field(default_factory=list)
-    created_at: float = field(default_factory=time.time)
-    last_active: float = field(default_factory=time.time)
-    metadata: Dict[str, Any] = field(default_factory=dict)
+    """
+    Represents a single conversation session
+
+    Uses __slots__ (no per-instance __dict__) and keeps message timestamps in a
+    parallel buffer instead of copying every message dict to add a key.
+    Plain class rather than @dataclass(slots=True) to stay Python 3.9 compatible.
+    """
+    __slots__ = (
+        'session_id', 'messages', 'created_at', 'last_active', 'metadata',
+        '_timestamps', '_user_count', '_by_role'
+    )
+
+    def __init__(
+        self,
+        session_id: str,
+        messages: Optional[List[Dict[str, Any]]] = None,
+        created_at: Optional[float] = None,
+        last_active: Optional[float] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ):
+        self.session_id = session_id
+        self.messages: Deque[Dict[str, Any]] = _message_buffer()
+        self.created_at = created_at if created_at is not None else time.time()
+        self.last_active = last_active if last_active is not None else time.time()
+        self.metadata = metadata if metadata is not None else {}
+        # Parallel to self.messages: timestamp of each retained message
+        self._timestamps: Deque[float] = deque(maxlen=MAX_SESSION_MESSAGES)
+        # Running indexes over the retained messages, maintained by add_message (including
+        # eviction) so role lookups avoid full scans
+        self._user_count = 0
+        self._by_role: Dict[str, Deque[Dict[str, Any]]] = defaultdict(_message_buffer)
+
+        for message in messages or ():
+            self.add_message(message)
+
+    def __repr__(self) -> str:
+        return (f"ConversationSession(session_id={self.session_id!r}, "
+                f"messages={len(self.messages)}, last_active={self.last_active})")
 
     def add_message(self, message: Dict[str, Any]):
-        """Add a message to the conversation history"""
-        self.messages.append({
-            **message,
-            'timestamp': time.time()
-        })
-        self.last_active = time.time()
+        """
+        Add a message to the conversation history
+
+        The dict is stored by reference, not copied: callers hand over
+        ownership and must not mutate it afterwards. Its timestamp is kept in
+        a parallel buffer, see get_message_timestamp().
+        """
+        now = time.time()
+        if len(self.messages) == self.messages.maxlen:
+            # The oldest message is about to be evicted; it is also the oldest of its
+            # role, so drop it from the role indexes too and they never drift
+            evicted_role = self.messages[0].get('role')
+            self._by_role[evicted_role].popleft()
+            if evicted_role == 'user':
+                self._user_count -= 1
+        self.messages.append(message)
+        self._timestamps.append(now)
+        role = message.get('role')
+        self._by_role[role].append(message)
+        if role == 'user':
+            self._user_count += 1
+        self.last_active = now
+
+    def get_message_timestamp(self, index: int) -> float:
+        """Get the timestamp of the message at the given index in self.messages"""
+        return self._timestamps[index]
+
+    def clear_history(self):
+        """Clear all messages and reset the running role indexes"""
+        self.messages.clear()
+        self._timestamps.clear()
+        self._by_role.clear()
+        self._user_count = 0
 
     def get_history(self, max_messages: int = 20, role_filter: Optional[str] = None) -> List[Dict[str, Any]]:
         """
@@ -42,10 +108,12 @@ class ConversationSession:
         messages = self.messages
 
         if role_filter:
-            messages = [m for m in messages if m.get('role') == role_filter]
+            messages = self._by_role.get(role_filter, ())
 
         # Return last N messages
-        return messages[-max_messages:] if max_messages else messages
+        total = len(messages)
+        start = max(0, total - max_messages) if max_messages else 0
+        return list(islice(messages, start, total))
 
     def get_context_summary(self) -> str:
         """Generate a summary of recent conversation context"""
@@ -75,12 +143,11 @@ class ConversationSession:
         Returns:
             True if no user messages exist yet (first message scenario)
         """
-        user_messages = [m for m in self.messages if m.get('role') == 'user']
-        return len(user_messages) == 0
+        return self._user_count == 0
 
     def get_user_message_count(self) -> int:
         """Get the total number of user messages in this session"""
-        return len([m for m in self.messages if m.get('role') == 'user'])
+        return self._user_count
 
 
 class ConversationManager:
@@ -102,7 +169,8 @@ class ConversationManager:
             cleanup_interval: How often to run cleanup (seconds, default 15 min)
             session_timeout: How long before a session is considered stale (seconds, default 1 hour)
         """
-        self.sessions: Dict[str, ConversationSession] = {}
+        # Kept in least-recently-active order so cleanup can stop at the first live session
+        self.sessions: 'OrderedDict[str, ConversationSession]' = OrderedDict()
         self.cleanup_interval = cleanup_interval
         self.session_timeout = session_timeout
         self._lock_instance = None  # Lazy initialization to avoid event loop issues
@@ -143,14 +211,18 @@ class ConversationManager:
         async with self._lock:
             if session_id is None:
                 session_id = str(uuid.uuid4())
-
-            session = ConversationSession(
-                session_id=session_id,
-                metadata=metadata or {}
-            )
-            self.sessions[session_id] = session
-            await self._maybe_cleanup()
-            return session
+            return self._new_session(session_id, metadata)
+
+    def _new_session(self, session_id: str, metadata: Optional[Dict[str, Any]] = None) -> ConversationSession:
+        """Create and register a session (caller must hold the lock)"""
+        session = ConversationSession(
+            session_id=session_id,
+            metadata=metadata or {}
+        )
+        self.sessions[session_id] = session
+        self.sessions.move_to_end(session_id)
+        self._maybe_cleanup()
+        return session
 
     async def get_session(self, session_id: str) -> Optional[ConversationSession]:
         """
@@ -162,8 +234,8 @@ class ConversationManager:
         Returns:
             ConversationSession if found, None otherwise
         """
-        async with self._lock:
-            return self.sessions.get(session_id)
+        # Single dict read - atomic under the GIL, no await point to guard
+        return self.sessions.get(session_id)
 
     async def get_or_create_session(self, session_id: str, metadata: Optional[Dict[str, Any]] = None) -> ConversationSession:
         """
@@ -176,12 +248,13 @@ class ConversationManager:
         Returns:
             ConversationSession instance
         """
+        # Check-and-insert in one critical section so concurrent callers
+        # can't both create a session for the same ID
         async with self._lock:
-            if session_id in self.sessions:
-                return self.sessions[session_id]
-            # Release lock before calling create_session (which will acquire it again)
-        # If not found, create new session (will acquire lock internally)
-        return await self.create_session(session_id, metadata)
+            session = self.sessions.get(session_id)
+            if session is not None:
+                return session
+            return self._new_session(session_id, metadata)
 
     async def add_user_message(self, session_id: str, message: str, metadata: Optional[Dict[str, Any]] = None) -> ConversationSession:
         """
@@ -196,11 +269,11 @@ class ConversationManager:
             Updated ConversationSession
         """
         session = await self.get_or_create_session(session_id)
-        session.add_message({
-            'role': 'user',
-            'content': message,
-            **(metadata or {})
-        })
+        entry = {'role': 'user', 'content': message}
+        if metadata:
+            entry.update(metadata)
+        session.add_message(entry)
+        self._touch(session_id)
         return session
 
     async def add_agent_message(
@@ -225,15 +298,23 @@ class ConversationManager:
             Updated ConversationSession
         """
         session = await self.get_or_create_session(session_id)
-        session.add_message({
+        entry = {
             'role': 'agent',
             'agent_id': agent_id,
             'agent': agent_name,
-            'content': message,
-            **(metadata or {})
-        })
+            'content': message
+        }
+        if metadata:
+            entry.update(metadata)
+        session.add_message(entry)
+        self._touch(session_id)
         return session
 
+    def _touch(self, session_id: str):
+        """Move a session to the most-recently-active end of the eviction order"""
+        if session_id in self.sessions:
+            self.sessions.move_to_end(session_id)
+
     async def delete_session(self, session_id: str) -> bool:
         """
         Delete a conversation session
@@ -263,20 +344,19 @@ class ConversationManager:
         async with self._lock:
             session = self.sessions.get(session_id)
             if session:
-                session.messages.clear()
+                session.clear_history()
                 session.last_active = time.time()
+                self._touch(session_id)
                 return True
             return False
 
     async def get_all_sessions(self) -> List[ConversationSession]:
-        """Get all active sessions"""
-        async with self._lock:
-            return list(self.sessions.values())
+        """Get all active sessions (lock-free snapshot)"""
+        return list(self.sessions.values())
 
     async def get_session_count(self) -> int:
-        """Get the number of active sessions"""
-        async with self._lock:
-            return len(self.sessions)
+        """Get the number of active sessions (lock-free read)"""
+        return len(self.sessions)
 
     async def cleanup_stale_sessions(self) -> int:
         """
@@ -286,21 +366,31 @@ class ConversationManager:
             Number of sessions removed
         """
         async with self._lock:
-            stale_ids = [
-                sid for sid, session in self.sessions.items()
-                if session.is_stale(self.session_timeout)
-            ]
+            return self._cleanup_stale_locked()
+
+    def _cleanup_stale_locked(self) -> int:
+        """
+        Remove stale sessions (caller must hold the lock)
 
-            for sid in stale_ids:
-                del self.sessions[sid]
+        Sessions are ordered by last activity, so the scan stops at the first
+        session that is still live instead of visiting every session.
+        """
+        stale_ids = []
+        for sid, session in self.sessions.items():
+            if not session.is_stale(self.session_timeout):
+                break
+            stale_ids.append(sid)
+
+        for sid in stale_ids:
+            del self.sessions[sid]
 
-            self._last_cleanup = time.time()
-            return len(stale_ids)
+        self._last_cleanup = time.time()
+        return len(stale_ids)
 
-    async def _maybe_cleanup(self):
-        """Run cleanup if enough time has passed"""
+    def _maybe_cleanup(self):
+        """Run cleanup if enough time has passed (caller must hold the lock)"""
         if (time.time() - self._last_cleanup) > self.cleanup_interval:
-            await self.cleanup_stale_sessions()
+            self._cleanup_stale_locked()
 
     async def get_stats(self) -> Dict[str, Any]:
         """
@@ -310,22 +400,28 @@ class ConversationManager:
             Dictionary with session statistics
         """
         async with self._lock:
-            total_messages = sum(len(s.messages) for s in self.sessions.values())
-            avg_messages = total_messages / len(self.sessions) if self.sessions else 0
-
-            return {
-                'total_sessions': len(self.sessions),
-                'total_messages': total_messages,
-                'avg_messages_per_session': avg_messages,
-                'oldest_session_age': min(
-                    (time.time() - s.created_at for s in self.sessions.values()),
-                    default=0
-                ),
-                'most_recent_activity': max(
-                    (s.last_active for s in self.sessions.values()),
-                    default=0
-                )
-            }
+            sessions = list(self.sessions.values())
+
+        # Aggregate in a single pass outside the lock
+        now = time.time()
+        total_messages = 0
+        oldest_age = 0
+        most_recent = 0
+        for s in sessions:
+            total_messages += len(s.messages)
+            age = now - s.created_at
+            if age > oldest_age:
+                oldest_age = age
+            if s.last_active > most_recent:
+                most_recent = s.last_active
+
+        return {
+            'total_sessions': len(sessions),
+            'total_messages': total_messages,
+            'avg_messages_per_session': total_messages / len(sessions) if sessions else 0,
+            'oldest_session_age': oldest_age,
+            'most_recent_activity': most_recent
+        }
 
 
 # Global conversation manager instance
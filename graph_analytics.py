@@ -3,9 +3,70 @@ Graph Analytics for Knowledge Graph
 Computes centrality metrics, clustering, and spatial layouts
 """
 import networkx as nx
+import numpy as np
+import scipy.sparse as sp
+import scipy.sparse.csgraph as csgraph
+import scipy.sparse.linalg as spla
+from scipy.spatial import cKDTree
 from typing import Dict, List, Any, Set, Tuple, Optional
 from collections import defaultdict
+from functools import cached_property
 import math
+import random
+
+try:
+    import networkit as nk  # Optional: C++ centrality/community kernels
+except ImportError:
+    nk = None
+
+try:
+    import igraph as ig  # Optional: C force-directed layout
+except ImportError:
+    ig = None
+
+try:
+    from numba import njit  # Optional: JIT for the CSR breadth-first search
+except ImportError:
+    njit = None
+
+
+def _bfs_visited_mask(indptr, indices, start, depth, n_nodes):
+    """
+    Depth-limited BFS over a CSR adjacency
+
+    Returns:
+        Boolean array marking every node within `depth` hops of `start` (inclusive)
+    """
+    visited = np.zeros(n_nodes, dtype=np.bool_)
+    visited[start] = True
+    frontier = np.empty(n_nodes, dtype=np.int64)
+    next_frontier = np.empty(n_nodes, dtype=np.int64)
+    frontier[0] = start
+    size = 1
+
+    for _ in range(depth):
+        next_size = 0
+        for k in range(size):
+            u = frontier[k]
+            for p in range(indptr[u], indptr[u + 1]):
+                v = indices[p]
+                if not visited[v]:
+                    visited[v] = True
+                    next_frontier[next_size] = v
+                    next_size += 1
+        if next_size == 0:
+            break
+        frontier, next_frontier = next_frontier, frontier
+        size = next_size
+
+    return visited
+
+
+# Compiled BFS when numba is available; otherwise get_neighborhood uses sparse row gathers
+_bfs_visited_mask_jit = njit(cache=True)(_bfs_visited_mask) if njit is not None else None
+
+# Vocabulary entry for nodes that lack an attribute (distinct from an explicit None value)
+_MISSING = object()
 
 
 class GraphAnalytics:
@@ -29,7 +90,230 @@ class GraphAnalytics:
         """
         self.graph = graph
         self._centrality_cache = {}
-        self._cluster_cache = None
+        self._cluster_cache_by_algo: Dict[str, Dict[str, int]] = {}  # Keyed by requested algorithm
+        self._nodelist = None  # Node order for the cached sparse adjacency
+        self._adjacency = None  # CSR adjacency matrix (built lazily, reused by metrics)
+        self._nk_graph = None  # Undirected NetworKit copy (built lazily when networkit is installed)
+        # Structure-of-arrays view (see _build_soa): node index, undirected CSR, attribute codes
+        self._id2idx = None
+        self._undirected_adjacency = None
+        self._csr_indptr = None
+        self._csr_indices = None
+        self._type_codes = None
+        self._type_vocab = None
+        self._person_codes = None
+        self._person_vocab = None
+        self._category_codes = None
+        self._category_vocab = None
+
+    @cached_property
+    def undirected(self) -> nx.Graph:
+        """Undirected read-only view of the graph (no copy), shared by all metrics"""
+        return self.graph.to_undirected(as_view=True)
+
+    def _get_adjacency(self) -> Tuple[List[str], sp.csr_array]:
+        """
+        Get the directed adjacency matrix in CSR form, building it once
+
+        Returns:
+            Tuple of (nodelist, csr adjacency) where row/column i is nodelist[i]
+        """
+        if self._adjacency is None:
+            self._nodelist = list(self.graph.nodes())
+            if not self._nodelist:
+                # to_scipy_sparse_array rejects empty graphs
+                self._adjacency = sp.csr_array((0, 0), dtype=np.float64)
+            else:
+                self._adjacency = nx.to_scipy_sparse_array(
+                    self.graph,
+                    nodelist=self._nodelist,
+                    weight=None,
+                    dtype=np.float64,
+                    format='csr'
+                )
+        return self._nodelist, self._adjacency
+
+    def _build_soa(self) -> None:
+        """
+        Build flat array views of the graph once: a node index, an undirected CSR
+        adjacency (successors + predecessors) and integer-coded node attributes
+        """
+        nodelist, A = self._get_adjacency()
+        self._id2idx = {node: i for i, node in enumerate(nodelist)}
+
+        # Undirected, unweighted adjacency: an edge in either direction counts once
+        self._undirected_adjacency = sp.csr_array(((A + A.T) > 0).astype(np.float64))
+        self._csr_indptr = self._undirected_adjacency.indptr
+        self._csr_indices = self._undirected_adjacency.indices
+
+        # Attribute dicts in nodelist order, gathered in one nodes(data=True) sweep
+        node_attrs = [data for _, data in self.graph.nodes(data=True)]
+        self._type_codes, self._type_vocab = self._encode_attribute(
+            data.get('type', _MISSING) for data in node_attrs
+        )
+        self._person_codes, self._person_vocab = self._encode_attribute(
+            data.get('person', _MISSING) for data in node_attrs
+        )
+        self._category_codes, self._category_vocab = self._encode_attribute(
+            data.get('category', _MISSING) for data in node_attrs
+        )
+
+    def _encode_attribute(self, values) -> Tuple[np.ndarray, List[Any]]:
+        """Encode attribute values as int32 codes plus the code -> value vocabulary"""
+        vocab: Dict[Any, int] = {}
+        codes = np.fromiter(
+            (vocab.setdefault(value, len(vocab)) for value in values),
+            dtype=np.int32,
+            count=len(self._nodelist)
+        )
+        return codes, list(vocab)
+
+    @staticmethod
+    def _count_by_code(codes: np.ndarray, vocab: List[Any], default: Any) -> Dict[Any, int]:
+        """
+        Count nodes per attribute value with one bincount over the attribute codes
+
+        Args:
+            codes: Per-node attribute codes (from _encode_attribute)
+            vocab: Code -> attribute value
+            default: Key used for nodes missing the attribute
+
+        Returns:
+            Dictionary mapping attribute value to node count (first-seen order)
+        """
+        counts: Dict[Any, int] = {}
+        for code, count in enumerate(np.bincount(codes, minlength=len(vocab)).tolist()):
+            value = vocab[code]
+            key = default if value is _MISSING else value
+            counts[key] = counts.get(key, 0) + count
+        return counts
+
+    def _group_by_code(self, codes: np.ndarray, vocab: List[Any], default: Any) -> Dict[Any, Set[str]]:
+        """
+        Bucket node IDs per attribute value using a stable argsort split on code boundaries
+
+        Args:
+            codes: Per-node attribute codes (from _encode_attribute)
+            vocab: Code -> attribute value
+            default: Key used for nodes missing the attribute
+
+        Returns:
+            Dictionary mapping attribute value to the set of node IDs (first-seen order)
+        """
+        if not vocab:
+            return {}
+        nodelist = self._nodelist
+        order = np.argsort(codes, kind='stable')
+        boundaries = np.cumsum(np.bincount(codes, minlength=len(vocab)))[:-1]
+        groups: Dict[Any, Set[str]] = {}
+        for code, members in enumerate(np.split(order, boundaries)):
+            value = vocab[code]
+            key = default if value is _MISSING else value
+            groups.setdefault(key, set()).update(nodelist[i] for i in members.tolist())
+        return groups
+
+    def _get_networkit_graph(self) -> Tuple[List[str], Any]:
+        """
+        Get an undirected NetworKit copy of the graph, building it once
+
+        Returns:
+            Tuple of (nodelist, networkit graph) where NetworKit node i is nodelist[i]
+        """
+        if self._nk_graph is None:
+            nodelist, _ = self._get_adjacency()
+            index = {node: i for i, node in enumerate(nodelist)}
+            nk_graph = nk.Graph(len(nodelist), weighted=False, directed=False)
+            for u, v in self.graph.edges():
+                iu, iv = index[u], index[v]
+                if iu != iv and not nk_graph.hasEdge(iu, iv):
+                    nk_graph.addEdge(iu, iv)
+            self._nk_graph = nk_graph
+        return self._nodelist, self._nk_graph
+
+    def _pagerank(self, alpha: float = 0.85, max_iter: int = 100, tol: float = 1e-6) -> Dict[str, float]:
+        """
+        PageRank by sparse power iteration on the cached CSR adjacency
+
+        Matches nx.pagerank (uniform teleport, dangling mass spread uniformly)
+        but keeps the per-iteration work in a single SpMV.
+
+        Raises:
+            nx.PowerIterationFailedConvergence: If not converged within max_iter
+        """
+        nodelist, A = self._get_adjacency()
+        n = len(nodelist)
+        if n == 0:
+            return {}
+
+        # Row-normalize to a transition matrix; rows with no out-edges are dangling
+        out_degree = np.asarray(A.sum(axis=1)).ravel()
+        dangling = out_degree == 0
+        inv_out = np.divide(1.0, out_degree, out=np.zeros(n), where=~dangling)
+        M = sp.diags_array(inv_out) @ A
+
+        x = np.full(n, 1.0 / n)
+        for _ in range(max_iter):
+            x_prev = x
+            x = alpha * (x_prev @ M + x_prev[dangling].sum() / n) + (1.0 - alpha) / n
+            if np.abs(x - x_prev).sum() < n * tol:
+                return dict(zip(nodelist, x.tolist()))
+
+        raise nx.PowerIterationFailedConvergence(max_iter)
+
+    def _eigenvector_centrality(self, max_iter: int = 100, tol: float = 1e-3) -> Dict[str, float]:
+        """
+        Eigenvector centrality of the undirected graph via ARPACK (scipy eigsh)
+
+        Uses the principal eigenvector of the symmetric adjacency built from the
+        cached CSR matrix, L2-normalized like nx.eigenvector_centrality.
+
+        Disconnected graphs are solved per connected component: the components
+        with the largest Perron root keep their eigenvector and every other node
+        gets 0, which is what power iteration converges to on the whole graph.
+        """
+        nodelist, _ = self._get_adjacency()
+        n = len(nodelist)
+        if n == 0:
+            return {}
+
+        if self._id2idx is None:
+            self._build_soa()
+        sym = self._undirected_adjacency
+        num_components, labels = csgraph.connected_components(sym, directed=False)
+
+        vec = np.zeros(n)
+        if num_components == 1:
+            vec = self._principal_eigenvector(sym, max_iter, tol)[1]
+        else:
+            roots = {}
+            for component in range(num_components):
+                members = np.flatnonzero(labels == component)
+                if len(members) < 2:
+                    continue  # Isolated node: eigenvalue 0, centrality 0
+                roots[component] = (members, *self._principal_eigenvector(
+                    sym[members][:, members], max_iter, tol
+                ))
+            if roots:
+                max_root = max(root for _, root, _ in roots.values())
+                for members, root, component_vec in roots.values():
+                    if np.isclose(root, max_root):
+                        vec[members] = component_vec
+
+        vec = np.abs(vec)
+        norm = np.linalg.norm(vec)
+        if norm > 0:
+            vec = vec / norm
+        return dict(zip(nodelist, vec.tolist()))
+
+    def _principal_eigenvector(self, sym: sp.csr_array, max_iter: int, tol: float) -> Tuple[float, np.ndarray]:
+        """Largest eigenvalue and its eigenvector of a symmetric non-negative matrix"""
+        n = sym.shape[0]
+        if n <= 2:
+            vals, vecs = np.linalg.eigh(sym.toarray())
+            return float(vals[-1]), vecs[:, -1]
+        # Largest algebraic eigenvalue is the Perron root of a non-negative matrix
+        vals, vecs = spla.eigsh(sym, k=1, which='LA', maxiter=max_iter * n, tol=tol)
+        return float(vals[0]), vecs[:, 0]
 
     def compute_centrality_metrics(self, force_recompute: bool = False) -> Dict[str, Dict[str, float]]:
         """
@@ -48,32 +332,53 @@ class GraphAnalytics:
 
         metrics = {}
 
-        # Convert to undirected for some metrics
-        undirected_graph = self.graph.to_undirected()
+        # Undirected view for some metrics
+        undirected_graph = self.undirected
 
         # 1. Degree Centrality (normalized)
         degree_centrality = nx.degree_centrality(undirected_graph)
 
+        # Betweenness and eigenvector are all zero without edges, so skip them outright
+        # (NetworKit kernels also crash or return NaN on empty/edgeless graphs)
+        has_edges = self.graph.number_of_edges() > 0
+        use_networkit = nk is not None and has_edges
+
         # 2. Betweenness Centrality (how often node appears on shortest paths)
         try:
-            betweenness_centrality = nx.betweenness_centrality(undirected_graph, k=100)
-        except:
+            if not has_edges:
+                betweenness_centrality = {node: 0.0 for node in self.graph.nodes()}
+            elif use_networkit:
+                nodelist, nk_graph = self._get_networkit_graph()
+                # Riondato-Kornaropoulos sampling: error <= epsilon with probability 1 - delta
+                scores = nk.centrality.ApproxBetweenness(nk_graph, epsilon=0.05, delta=0.1).run().scores()
+                betweenness_centrality = dict(zip(nodelist, scores))
+            else:
+                # Sample sources in proportion to log |V| (exact below ~50 nodes)
+                num_nodes = undirected_graph.number_of_nodes()
+                k = min(num_nodes, max(50, int(math.log2(num_nodes) * 20)))
+                betweenness_centrality = nx.betweenness_centrality(undirected_graph, k=k)
+        except (nx.NetworkXException, RuntimeError, ValueError) as e:
+            print(f"Warning: betweenness centrality failed ({e}), using zeros")
             betweenness_centrality = {node: 0.0 for node in self.graph.nodes()}
 
         # 3. PageRank (importance based on connections)
         try:
-            pagerank = nx.pagerank(self.graph, max_iter=100)
-        except:
+            pagerank = self._pagerank(max_iter=100)
+        except nx.PowerIterationFailedConvergence:
             pagerank = {node: 1.0 / len(self.graph.nodes()) for node in self.graph.nodes()}
 
         # 4. Eigenvector Centrality (connections to important nodes)
         try:
-            eigenvector_centrality = nx.eigenvector_centrality(
-                undirected_graph,
-                max_iter=100,
-                tol=1e-3
-            )
-        except:
+            if not has_edges:
+                eigenvector_centrality = {node: 0.0 for node in self.graph.nodes()}
+            elif use_networkit:
+                nodelist, nk_graph = self._get_networkit_graph()
+                scores = nk.centrality.EigenvectorCentrality(nk_graph).run().scores()
+                eigenvector_centrality = dict(zip(nodelist, scores))
+            else:
+                eigenvector_centrality = self._eigenvector_centrality(max_iter=100, tol=1e-3)
+        except (nx.NetworkXException, RuntimeError, ValueError) as e:
+            print(f"Warning: eigenvector centrality failed ({e}), using zeros")
             eigenvector_centrality = {node: 0.0 for node in self.graph.nodes()}
 
         # Combine metrics
@@ -128,16 +433,32 @@ class GraphAnalytics:
         Returns:
             Dictionary mapping node IDs to cluster IDs
         """
-        if self._cluster_cache is not None:
-            return self._cluster_cache
+        cached = self._cluster_cache_by_algo.get(algorithm)
+        if cached is not None:
+            return cached
+        requested_algorithm = algorithm
 
         print(f"Detecting communities using {algorithm} algorithm...")
 
-        # Convert to undirected graph
-        undirected = self.graph.to_undirected()
+        # Undirected view of the graph
+        undirected = self.undirected
+        clusters = None
 
         try:
-            if algorithm == "louvain":
+            # Louvain fallback chain: NetworKit PLM -> python-louvain -> greedy_modularity
+            if algorithm == "louvain" and nk is not None:
+                try:
+                    # Parallel Louvain (PLM with refinement) from NetworKit
+                    nodelist, nk_graph = self._get_networkit_graph()
+                    plm = nk.community.PLM(nk_graph, refine=True, gamma=1.0, par='balanced')
+                    plm.run()
+                    partition = plm.getPartition()
+                    partition.compact()  # Contiguous cluster IDs like the NetworkX paths
+                    clusters = {node: partition.subsetOf(i) for i, node in enumerate(nodelist)}
+                except Exception as e:
+                    print(f"Warning: NetworKit PLM failed ({e}), falling back to python-louvain")
+
+            if algorithm == "louvain" and clusters is None:
                 # Louvain community detection (requires python-louvain package)
                 try:
                     import community as community_louvain
@@ -146,7 +467,15 @@ class GraphAnalytics:
                     print("Warning: python-louvain not installed, falling back to greedy_modularity")
                     algorithm = "greedy_modularity"
 
-            if algorithm == "label_propagation":
+            if algorithm == "label_propagation" and nk is not None:
+                nodelist, nk_graph = self._get_networkit_graph()
+                plp = nk.community.PLP(nk_graph)
+                plp.run()
+                partition = plp.getPartition()
+                partition.compact()
+                clusters = {node: partition.subsetOf(i) for i, node in enumerate(nodelist)}
+
+            elif algorithm == "label_propagation":
                 communities = nx.algorithms.community.label_propagation_communities(undirected)
                 clusters = {}
                 for idx, community in enumerate(communities):
@@ -160,11 +489,14 @@ class GraphAnalytics:
                     for node in community:
                         clusters[node] = idx
 
+            if clusters is None:
+                raise ValueError(f"Unknown algorithm '{requested_algorithm}'")
+
         except Exception as e:
             print(f"Community detection failed: {e}, assigning all to cluster 0")
             clusters = {node: 0 for node in self.graph.nodes()}
 
-        self._cluster_cache = clusters
+        self._cluster_cache_by_algo[requested_algorithm] = clusters
         num_clusters = len(set(clusters.values()))
         print(f"Found {num_clusters} communities")
         return clusters
@@ -176,30 +508,14 @@ class GraphAnalytics:
         Returns:
             Dictionary with cluster types and their node sets
         """
-        clusters = {
-            'by_type': defaultdict(set),
-            'by_person': defaultdict(set),
-            'by_category': defaultdict(set)
-        }
-
-        for node in self.graph.nodes():
-            node_data = self.graph.nodes[node]
-
-            # Cluster by type
-            node_type = node_data.get('type', 'unknown')
-            clusters['by_type'][node_type].add(node)
-
-            # Cluster by person
-            person = node_data.get('person', 'unknown')
-            clusters['by_person'][person].add(node)
+        if self._id2idx is None:
+            self._build_soa()
 
-            # Cluster by category
-            category = node_data.get('category', 'uncategorized')
-            clusters['by_category'][category].add(node)
-
-        # Convert defaultdict to regular dict
+        # Bucket nodes from the precomputed attribute codes instead of walking node dicts
         return {
-            key: dict(value) for key, value in clusters.items()
+            'by_type': self._group_by_code(self._type_codes, self._type_vocab, 'unknown'),
+            'by_person': self._group_by_code(self._person_codes, self._person_vocab, 'unknown'),
+            'by_category': self._group_by_code(self._category_codes, self._category_vocab, 'uncategorized')
         }
 
     def get_person_to_person_connections(self) -> Dict[Tuple[str, str], List[str]]:
@@ -211,32 +527,28 @@ class GraphAnalytics:
         """
         # Get nodes by person
         person_nodes = defaultdict(set)
-        for node in self.graph.nodes():
-            person = self.graph.nodes[node].get('person')
+        for node, data in self.graph.nodes(data=True):
+            person = data.get('person')
             if person:
                 person_nodes[person].add(node)
 
+        # Neighbour set (successors + predecessors) of each person's nodes, built once
+        person_neighbors = {}
+        for person, nodes in person_nodes.items():
+            neighbors = set()
+            for node in nodes:
+                neighbors.update(self.graph.successors(node))
+                neighbors.update(self.graph.predecessors(node))
+            person_neighbors[person] = neighbors
+
         # Find connections through shared nodes
         connections = {}
         people = list(person_nodes.keys())
 
         for i, person1 in enumerate(people):
             for person2 in people[i + 1:]:
-                # Get neighbors of person1's nodes
-                person1_neighbors = set()
-                for node in person_nodes[person1]:
-                    person1_neighbors.update(self.graph.neighbors(node))
-                    person1_neighbors.update(self.graph.predecessors(node))
-
-                # Get neighbors of person2's nodes
-                person2_neighbors = set()
-                for node in person_nodes[person2]:
-                    person2_neighbors.update(self.graph.neighbors(node))
-                    person2_neighbors.update(self.graph.predecessors(node))
-
-                # Find shared intermediate nodes
-                shared = person1_neighbors & person2_neighbors
-                # Exclude person nodes themselves
+                # Find shared intermediate nodes, excluding the people's own nodes
+                shared = person_neighbors[person1] & person_neighbors[person2]
                 shared = shared - person_nodes[person1] - person_nodes[person2]
 
                 if shared:
@@ -262,56 +574,85 @@ class GraphAnalytics:
         print("Computing spatial layout with person separation...")
 
         # Identify person nodes
-        person_nodes = set()
-        for node in self.graph.nodes():
-            if self.graph.nodes[node].get('type') == 'person':
-                person_nodes.add(node)
+        person_nodes = {
+            node for node, data in self.graph.nodes(data=True)
+            if data.get('type') == 'person'
+        }
 
         # Use spring layout with custom settings
         # Person nodes get strong repulsion
         k_value = 1.0 / math.sqrt(len(self.graph.nodes())) if self.graph.nodes() else 1.0
 
-        pos = nx.spring_layout(
-            self.graph,
-            k=k_value * 2,  # Increase spacing
-            iterations=100,
-            scale=1000,  # Larger scale
-            seed=42  # Reproducible layout
-        )
+        if ig is not None and self.graph.number_of_nodes() > 0:
+            pos = self._igraph_layout(iterations=100, scale=1000, seed=42)
+        else:
+            pos = nx.spring_layout(
+                self.graph,
+                k=k_value * 2,  # Increase spacing
+                iterations=100,
+                scale=1000,  # Larger scale
+                seed=42  # Reproducible layout
+            )
 
         # Post-process: ensure person nodes are far apart
-        person_positions = {node: pos[node] for node in person_nodes}
+        person_list = sorted(person_nodes)
+        person_pos = np.array([pos[node] for node in person_list], dtype=np.float64).reshape(-1, 2)
 
-        # Apply additional repulsion between person nodes
+        # Apply additional repulsion between person nodes, only for pairs a KD-tree finds too close
         for _ in range(50):  # Multiple passes
-            moved = False
-            for p1 in person_nodes:
-                for p2 in person_nodes:
-                    if p1 >= p2:
-                        continue
-
-                    # Calculate distance
-                    dx = pos[p2][0] - pos[p1][0]
-                    dy = pos[p2][1] - pos[p1][1]
-                    dist = math.sqrt(dx * dx + dy * dy)
-
-                    # If too close, push apart
-                    if dist < min_person_distance and dist > 0:
-                        moved = True
-                        # Normalize and push
-                        push_force = (min_person_distance - dist) / dist
-                        push_x = dx * push_force * 0.5
-                        push_y = dy * push_force * 0.5
-
-                        pos[p1] = (pos[p1][0] - push_x, pos[p1][1] - push_y)
-                        pos[p2] = (pos[p2][0] + push_x, pos[p2][1] + push_y)
-
-            if not moved:
+            pairs = cKDTree(person_pos).query_pairs(min_person_distance, output_type='ndarray')
+            if len(pairs) == 0:
                 break
+            i, j = pairs[:, 0], pairs[:, 1]
+
+            # diff = position of j relative to i
+            diff = person_pos[j] - person_pos[i]
+            dist = np.linalg.norm(diff, axis=1)
+
+            # If too close, push apart (query_pairs is inclusive of the radius)
+            close = (dist < min_person_distance) & (dist > 0)
+            if not close.any():
+                break
+            i, j, diff, dist = i[close], j[close], diff[close], dist[close]
+
+            # Normalize and push: both nodes of each close pair move away from each other
+            shift = diff * ((min_person_distance - dist) / dist * 0.5)[:, None]
+            np.subtract.at(person_pos, i, shift)
+            np.add.at(person_pos, j, shift)
+
+        for node, (x, y) in zip(person_list, person_pos.tolist()):
+            pos[node] = (x, y)
 
         print(f"Spatial layout computed: {len(person_nodes)} person nodes separated")
         return pos
 
+    def _igraph_layout(self, iterations: int, scale: float, seed: int) -> Dict[str, np.ndarray]:
+        """
+        Fruchterman-Reingold layout computed by igraph's C implementation
+
+        Args:
+            iterations: Number of layout iterations
+            scale: Half-width of the output box, as in nx.spring_layout
+            seed: Seed for the initial positions (reproducible layout)
+
+        Returns:
+            Dictionary mapping node IDs to position arrays, centered and rescaled like nx.spring_layout
+        """
+        nodelist, A = self._get_adjacency()
+        rows, cols = A.nonzero()
+        ig_graph = ig.Graph(n=len(nodelist), edges=np.column_stack((rows, cols)).tolist(), directed=False)
+
+        initial = np.random.default_rng(seed).random((len(nodelist), 2)).tolist()
+        # FR also draws random displacements, so seed igraph's RNG for the call
+        # (then restore igraph's default, the stdlib random module)
+        ig.set_random_number_generator(random.Random(seed))
+        try:
+            layout = ig_graph.layout_fruchterman_reingold(niter=iterations, seed=initial)
+        finally:
+            ig.set_random_number_generator(random)
+        coords = nx.rescale_layout(np.array(layout.coords, dtype=np.float64), scale=scale)
+        return dict(zip(nodelist, coords))
+
     def get_neighborhood(
         self,
         node_id: str,
@@ -329,33 +670,36 @@ class GraphAnalytics:
         Returns:
             Set of node IDs in the neighborhood
         """
-        if node_id not in self.graph:
+        if self._id2idx is None:
+            self._build_soa()
+
+        start = self._id2idx.get(node_id)
+        if start is None:
             return set()
 
-        neighborhood = set()
-        if include_node:
-            neighborhood.add(node_id)
-
-        # BFS to get N-hop neighbors
-        current_level = {node_id}
-        visited = {node_id}
-
-        for _ in range(depth):
-            next_level = set()
-            for node in current_level:
-                # Get both successors and predecessors (undirected neighborhood)
-                neighbors = set(self.graph.successors(node)) | set(self.graph.predecessors(node))
-                for neighbor in neighbors:
-                    if neighbor not in visited:
-                        visited.add(neighbor)
-                        next_level.add(neighbor)
-                        neighborhood.add(neighbor)
-
-            current_level = next_level
-            if not current_level:
-                break
+        # BFS over the undirected CSR (successors + predecessors)
+        if _bfs_visited_mask_jit is not None:
+            visited = _bfs_visited_mask_jit(
+                self._csr_indptr, self._csr_indices, start, depth, len(self._nodelist)
+            )
+        else:
+            # Level-synchronous: all neighbours of a level in one sparse row gather
+            visited = np.zeros(len(self._nodelist), dtype=bool)
+            visited[start] = True
+            frontier = np.array([start])
+
+            for _ in range(depth):
+                neighbors = np.unique(self._undirected_adjacency[frontier].indices)
+                frontier = neighbors[~visited[neighbors]]
+                if frontier.size == 0:
+                    break
+                visited[frontier] = True
+
+        if not include_node:
+            visited[start] = False
 
-        return neighborhood
+        nodelist = self._nodelist
+        return {nodelist[i] for i in np.flatnonzero(visited)}
 
     def get_agent_subgraph_nodes(self, agent_id: str) -> Set[str]:
         """
@@ -367,11 +711,16 @@ class GraphAnalytics:
         Returns:
             Set of node IDs
         """
-        nodes = set()
-        for node in self.graph.nodes():
-            if self.graph.nodes[node].get('person') == agent_id:
-                nodes.add(node)
-        return nodes
+        if self._id2idx is None:
+            self._build_soa()
+
+        try:
+            code = self._person_vocab.index(agent_id)
+        except ValueError:
+            return set()
+
+        nodelist = self._nodelist
+        return {nodelist[i] for i in np.flatnonzero(self._person_codes == code)}
 
     def compare_agent_graphs(self, agent1_id: str, agent2_id: str) -> Dict[str, Set[str]]:
         """
@@ -421,15 +770,10 @@ class GraphAnalytics:
         num_components = nx.number_weakly_connected_components(self.graph)
         stats['num_components'] = num_components
 
-        # Node type distribution
-        type_counts = defaultdict(int)
-        person_counts = defaultdict(int)
-        for node in self.graph.nodes():
-            node_data = self.graph.nodes[node]
-            type_counts[node_data.get('type', 'unknown')] += 1
-            person_counts[node_data.get('person', 'unknown')] += 1
-
-        stats['node_types'] = dict(type_counts)
-        stats['nodes_by_person'] = dict(person_counts)
+        # Node type distribution (counted from the precomputed attribute codes)
+        if self._id2idx is None:
+            self._build_soa()
+        stats['node_types'] = self._count_by_code(self._type_codes, self._type_vocab, 'unknown')
+        stats['nodes_by_person'] = self._count_by_code(self._person_codes, self._person_vocab, 'unknown')
 
         return stats
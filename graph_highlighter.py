@@ -7,6 +7,20 @@ from kg_loader import KnowledgeGraphLoader
 from utils import normalize_text, get_embedding, cosine_similarity, AGENT_COLORS
 import numpy as np
 
+try:
+    import ahocorasick  # Optional: pyahocorasick multi-pattern matcher
+except ImportError:
+    ahocorasick = None
+
+# Common tech keywords used to pull in related nodes
+TECH_KEYWORDS = {
+    'python': ['python', 'pandas', 'numpy', 'fastapi', 'django'],
+    'javascript': ['javascript', 'react', 'node', 'typescript', 'vue'],
+    'data': ['sql', 'postgres', 'mongodb', 'redis', 'database'],
+    'cloud': ['aws', 'azure', 'gcp', 'kubernetes', 'docker'],
+    'ai': ['machine learning', 'ai', 'llm', 'gpt', 'openai', 'neural network']
+}
+
 
 class GraphHighlighter:
     """Handles node highlighting logic for AI observability"""
@@ -17,6 +31,9 @@ class GraphHighlighter:
         
         # Build node name lookup for entity extraction
         self.node_lookup = {}
+        # Per-node caches so responses never re-normalize labels or rescan owners
+        self.normalized_labels: Dict[str, str] = {}
+        self.agent_nodes_by_id: Dict[str, List[str]] = {}
         for node_id, node_data in kg_loader.node_data.items():
             label = node_data.get('label', node_id)
             normalized_label = normalize_text(label)
@@ -27,6 +44,43 @@ class GraphHighlighter:
             if 'name' in props:
                 normalized_name = normalize_text(props['name'])
                 self.node_lookup[normalized_name] = node_id
+            
+            self.normalized_labels[node_id] = normalize_text(node_data.get('label', ''))
+            self.agent_nodes_by_id.setdefault(node_data.get('person'), []).append(node_id)
+        
+        # Outgoing-edge index so highlight edges only touch the highlighted nodes' adjacency:
+        # node -> ((target, edge_id, relationship), ...), plus each node's position in graph order.
+        # The merged graph is frozen (see KnowledgeGraphLoader.build_merged_graph), so the
+        # index is built once as immutable tuples and never goes stale
+        merged_graph = kg_loader.merged_graph
+        self._out_edges: Dict[str, Tuple[Tuple[str, str, str], ...]] = {}
+        self._node_order: Dict[str, int] = {}
+        for position, (source, targets) in enumerate(merged_graph.adjacency()):
+            self._node_order[source] = position
+            self._out_edges[source] = tuple(
+                (target, f"{source}-{target}", edge_data.get('relationship', 'related'))
+                for target, edge_data in targets.items()
+            )
+        
+        # Every phrase we look for as a substring of a response: node labels + tech keywords
+        self._phrases = set(self.node_lookup)
+        for keywords in TECH_KEYWORDS.values():
+            self._phrases.update(keywords)
+        self._phrases.discard('')
+        
+        # Compile all phrases into one Aho-Corasick automaton (single pass per response)
+        self._automaton = None
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for phrase in self._phrases:
+                self._automaton.add_word(phrase, phrase)
+            self._automaton.make_automaton()
+    
+    def _find_phrases(self, normalized_response: str) -> Set[str]:
+        """Return the known phrases (labels/keywords) occurring as substrings of the response"""
+        if self._automaton is not None:
+            return {phrase for _, phrase in self._automaton.iter(normalized_response)}
+        return {phrase for phrase in self._phrases if phrase in normalized_response}
     
     def extract_entities(self, agent_response: str, agent_id: str) -> List[Tuple[str, float]]:
         """
@@ -34,16 +88,19 @@ class GraphHighlighter:
         Returns list of (node_id, relevance_score) tuples
         """
         entities_with_scores = []
+        seen_ids = set()  # node IDs already in entities_with_scores
         normalized_response = normalize_text(agent_response)
         response_words = set(normalized_response.split())
+        found_phrases = self._find_phrases(normalized_response)
         
         # Method 1: Direct keyword matching
         for normalized_label, node_id in self.node_lookup.items():
             label_words = set(normalized_label.split())
             
             # Check for exact phrase match
-            if normalized_label in normalized_response:
+            if normalized_label in found_phrases:
                 entities_with_scores.append((node_id, 1.0))
+                seen_ids.add(node_id)
                 continue
             
             # Check for significant word overlap (for multi-word terms)
@@ -52,56 +109,43 @@ class GraphHighlighter:
                 if len(overlap) >= len(label_words) * 0.6:  # 60% word match
                     score = len(overlap) / len(label_words)
                     entities_with_scores.append((node_id, score))
+                    seen_ids.add(node_id)
                     continue
             
             # Check for single significant word
             if len(label_words) == 1:
-                word = list(label_words)[0]
+                word = next(iter(label_words))
                 if len(word) > 3 and word in response_words:
                     entities_with_scores.append((node_id, 0.8))
+                    seen_ids.add(node_id)
         
         # Method 2: Get nodes owned by this agent
         agent_nodes = self._get_agent_nodes(agent_id)
         for node_id in agent_nodes:
-            if node_id not in [e[0] for e in entities_with_scores]:
+            if node_id not in seen_ids:
                 # Add with lower relevance if not already found
                 entities_with_scores.append((node_id, 0.3))
+                seen_ids.add(node_id)
         
         # Method 3: Common tech keywords
-        tech_keywords = {
-            'python': ['python', 'pandas', 'numpy', 'fastapi', 'django'],
-            'javascript': ['javascript', 'react', 'node', 'typescript', 'vue'],
-            'data': ['sql', 'postgres', 'mongodb', 'redis', 'database'],
-            'cloud': ['aws', 'azure', 'gcp', 'kubernetes', 'docker'],
-            'ai': ['machine learning', 'ai', 'llm', 'gpt', 'openai', 'neural network']
-        }
-        
-        for category, keywords in tech_keywords.items():
+        for category, keywords in TECH_KEYWORDS.items():
             for keyword in keywords:
-                if keyword in normalized_response:
+                if keyword in found_phrases:
                     # Find matching nodes
-                    for node_id, node_data in self.kg_loader.node_data.items():
-                        node_label = normalize_text(node_data.get('label', ''))
-                        if keyword in node_label and node_id not in [e[0] for e in entities_with_scores]:
+                    for node_id, node_label in self.normalized_labels.items():
+                        if keyword in node_label and node_id not in seen_ids:
                             entities_with_scores.append((node_id, 0.6))
+                            seen_ids.add(node_id)
         
-        # Remove duplicates and sort by score
-        seen = set()
-        unique_entities = []
-        for node_id, score in sorted(entities_with_scores, key=lambda x: x[1], reverse=True):
-            if node_id not in seen:
-                seen.add(node_id)
-                unique_entities.append((node_id, score))
+        # Sort by score (stable; entries are already unique via seen_ids - node_lookup
+        # maps each node from a single normalized label/name)
+        entities_with_scores.sort(key=lambda x: x[1], reverse=True)
         
-        return unique_entities[:15]  # Limit to top 15 nodes
+        return entities_with_scores[:15]  # Limit to top 15 nodes
     
     def _get_agent_nodes(self, agent_id: str) -> List[str]:
-        """Get all nodes owned by a specific agent"""
-        agent_nodes = []
-        for node_id, node_data in self.kg_loader.node_data.items():
-            if node_data.get('person') == agent_id:
-                agent_nodes.append(node_id)
-        return agent_nodes
+        """Get all nodes owned by a specific agent (precomputed index)"""
+        return self.agent_nodes_by_id.get(agent_id, [])
     
     def get_highlight_data(self, agent_id: str, entities: List[Tuple[str, float]]) -> Dict[str, Any]:
         """
@@ -136,15 +180,20 @@ class GraphHighlighter:
         """Get edges connecting highlighted nodes"""
         node_set = set(node_ids)
         relevant_edges = []
+        out_edges = self._out_edges
         
-        for source, target, edge_data in self.kg_loader.merged_graph.edges(data=True):
-            if source in node_set and target in node_set:
-                relevant_edges.append({
-                    'id': f"{source}-{target}",
-                    'source': source,
-                    'target': target,
-                    'relationship': edge_data.get('relationship', 'related')
-                })
+        # Walk only the highlighted nodes' outgoing edges, sources in graph order
+        # so the result matches a full merged_graph.edges() scan
+        sources = sorted(node_set.intersection(out_edges), key=self._node_order.__getitem__)
+        for source in sources:
+            for target, edge_id, relationship in out_edges[source]:
+                if target in node_set:
+                    relevant_edges.append({
+                        'id': edge_id,
+                        'source': source,
+                        'target': target,
+                        'relationship': relationship
+                    })
         
         return relevant_edges
     
@@ -160,27 +209,20 @@ class GraphHighlighter:
             # Process nodes
             for node in highlight_data.get('nodes', []):
                 node_id = node['id']
-                if node_id in all_nodes:
-                    # Node already highlighted by another agent
-                    # Increase intensity (up to max 1.0)
-                    all_nodes[node_id]['intensity'] = min(
-                        all_nodes[node_id]['intensity'] + node['intensity'] * 0.5,
-                        1.0
-                    )
-                    # Add this agent to the list
-                    all_nodes[node_id]['agents'].append(agent_id)
-                    # Keep pulse if any agent has it
-                    all_nodes[node_id]['pulse'] = all_nodes[node_id]['pulse'] or node['pulse']
-                else:
-                    all_nodes[node_id] = {
-                        **node,
-                        'agents': [agent_id]
-                    }
+                merged = all_nodes.get(node_id)
+                if merged is None:
+                    all_nodes[node_id] = {**node, 'agents': [agent_id]}
+                    continue
+                
+                # Node already highlighted by another agent:
+                # increase intensity (up to max 1.0), add this agent, keep pulse if any agent has it
+                merged['intensity'] = min(merged['intensity'] + node['intensity'] * 0.5, 1.0)
+                merged['agents'].append(agent_id)
+                merged['pulse'] = merged['pulse'] or node['pulse']
             
             # Process edges
             for edge in highlight_data.get('edges', []):
-                edge_id = edge['id']
-                all_edges[edge_id] = edge
+                all_edges[edge['id']] = edge
         
         return {
             'nodes': list(all_nodes.values()),
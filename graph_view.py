@@ -1,10 +1,16 @@
 """
 Graph View - Converts NetworkX graph to Cytoscape.js format
 """
-from typing import Dict, List, Any
+import json
+from typing import Dict, List, Any, Optional
 from kg_loader import KnowledgeGraphLoader
 from utils import AGENT_COLORS, NODE_TYPE_COLORS
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 class GraphView:
     """Converts knowledge graph data to Cytoscape.js format"""
@@ -14,21 +20,28 @@ class GraphView:
         
     def generate_cytoscape_elements(self) -> List[Dict[str, Any]]:
         """Generate Cytoscape.js elements (nodes + edges)"""
-        elements = []
+        node_data = self.kg_loader.node_data
+        merged_graph = self.kg_loader.merged_graph
+        num_nodes = len(node_data)
+        
+        # Pre-size the list (nodes first, then edges) instead of growing it
+        elements: List[Any] = [None] * (num_nodes + merged_graph.number_of_edges())
+        agent_color = AGENT_COLORS.get
+        type_color = NODE_TYPE_COLORS.get
         
         # Add nodes
-        for node_id, node_attrs in self.kg_loader.node_data.items():
+        for i, (node_id, node_attrs) in enumerate(node_data.items()):
             node_type = node_attrs.get('type', 'unknown')
             person = node_attrs.get('person', '')
             label = node_attrs.get('label', node_id)
             
             # Color by person (agent) if it's a person node, otherwise by type
             if node_type == 'person':
-                color = AGENT_COLORS.get(person, '#999999')
+                color = agent_color(person, '#999999')
             else:
-                color = NODE_TYPE_COLORS.get(node_type, '#999999')
+                color = type_color(node_type, '#999999')
             
-            elements.append({
+            elements[i] = {
                 'data': {
                     'id': node_id,
                     'label': label,
@@ -38,14 +51,14 @@ class GraphView:
                     'properties': node_attrs.get('properties', {})
                 },
                 'classes': f"{node_type} {person}"
-            })
+            }
         
         # Add edges
-        for source, target, edge_attrs in self.kg_loader.merged_graph.edges(data=True):
+        for i, (source, target, edge_attrs) in enumerate(merged_graph.edges(data=True), num_nodes):
             edge_id = f"{source}-{target}"
             relationship = edge_attrs.get('relationship', 'related')
             
-            elements.append({
+            elements[i] = {
                 'data': {
                     'id': edge_id,
                     'source': source,
@@ -53,7 +66,23 @@ class GraphView:
                     'label': relationship,
                     'relationship': relationship
                 }
-            })
+            }
         
         return elements
-
+    
+    def generate_graph_payload_json(self, elements: Optional[List[Dict[str, Any]]] = None) -> bytes:
+        """
+        Serialize the full graph payload ({nodes, edges, elements}) to JSON bytes once,
+        so it can be served as-is instead of being re-encoded on every request
+        """
+        if elements is None:
+            elements = self.generate_cytoscape_elements()
+        
+        payload = {
+            'nodes': len(self.kg_loader.node_data),
+            'edges': self.kg_loader.merged_graph.number_of_edges(),
+            'elements': elements
+        }
+        if orjson is not None:
+            return orjson.dumps(payload)
+        return json.dumps(payload).encode()
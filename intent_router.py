@@ -1,16 +1,128 @@
 """
 LLM-Based Intent Router for Multi-Agent System
-Routes user queries and agent responses to the appropriate agents based on LLM analysis
-NO FALLBACKS - Pure LLM routing or explicit error
+Routes user queries and agent responses to the appropriate agents, in tiers:
+
+User queries:
+1. Fast paths: @mentions, a message opening by addressing one agent, explicit
+   team activation phrases and bare greetings are routed without an LLM call
+2. Exact cache of earlier decisions (normalized query + recent context)
+3. Semantic cache: embedding similarity for queries without conversation
+   context, guarded by which agents the query names
+4. LLM routing (batched across concurrent async queries); its decision is cached
+
+Agent responses: a pre-scan (mentions, questions addressed to a teammate,
+delegation language) and a cache of responses with no handoff skip the LLM;
+anything else is classified by the LLM (active handoff vs passive mention).
+
+When the LLM is needed and fails, IntentRouterError is raised: there is no
+heuristic fallback routing.
 """
+import asyncio
+import hashlib
 import json
+import os
 import re
-from typing import Dict, List, Any, Set, Optional
-from dataclasses import dataclass
+import sys
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Any, Set, Optional, Tuple, Callable, Awaitable, Iterator
+from dataclasses import dataclass, replace
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ahocorasick  # Optional: pyahocorasick multi-pattern matcher
+except ImportError:
+    ahocorasick = None
+
+try:
+    import re2  # Optional: google-re2, linear-time (DFA) regex matching
+except ImportError:
+    re2 = None
+
+try:
+    import tiktoken  # Optional: exact token counts for the routing context budget
+except ImportError:
+    tiktoken = None
+
+from utils import get_embedding, get_embeddings
 
 # Avoid circular import - AGENTS will be imported when needed
 AGENTS = None
 
+# Regex patterns compiled once at import time
+_AT_MENTION_RE = re.compile(r'@(\w+)')
+# Delegation phrasing that can hand off without naming anyone (e.g. "our data engineer should weigh in")
+_DELEGATION_RE = re.compile(
+    r'\b(?:hand(?:ing)?\s+(?:this|it)\s+(?:off|over|to)|over\s+to\s+you|let\s+me\s+pass|'
+    r'pass(?:ing)?\s+(?:this|it)\s+(?:to|along)|weigh\s+in|chime\s+in)\b',
+    re.IGNORECASE
+)
+# Explicit requests for the whole team (routed without an LLM call when nobody is named);
+# a bare "everyone"/"all" ("Does everyone here use Kafka?") is left to the LLM
+_TEAM_ACTIVATION_RE = re.compile(
+    r'\b(?:hear\s+from\s+(?:everyone|everybody|all\s+of\s+you|the\s+(?:whole\s+)?team)|'
+    r'all\s+of\s+you|bring\s+in\s+the\s+(?:whole\s+)?team)\b|'
+    r'^\s*(?:everyone|everybody|(?:whole|entire)\s+team)\s*[,:]',
+    re.IGNORECASE
+)
+# Greetings that mark a following name as a direct mention ("hey Mathew")
+_GREETINGS = ('hey', 'hi', 'yo')
+# Messages that are only a greeting, in common languages ("hi", "Good morning team!",
+# "hola", "你好"); routed to Rahil's team introduction without an LLM call
+_GREETING_RE = re.compile(
+    r"\s*(?:hi+|hello+|hey+|hiya|howdy|yo|sup|greetings|good\s+(?:morning|afternoon|evening|day)|"
+    r"what['’]?s\s+up|wass?up|hola|buen[oa]s\s+(?:d[ií]as|tardes|noches)|bonjour|salut|hallo|"
+    r"guten\s+(?:tag|morgen|abend)|ciao|ol[aá]|namaste|konnichiwa|こんにちは|你好|您好|안녕하세요|"
+    r"привет|здравствуйте|مرحبا|नमस्ते)"
+    r"(?:\s+(?:there|team|all|everyone|everybody|guys|folks|y['’]?all))?[\W_]*",
+    re.IGNORECASE
+)
+_PUNCTUATION_RE = re.compile(r'[^\w\s]')
+_WORD_RE = re.compile(r'\w+')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Routing decision cache (per IntentRouter instance)
+ROUTING_CACHE_SIZE = 1024  # Max cached decisions, least recently used evicted first
+SEMANTIC_CACHE_THRESHOLD = 0.95  # Min cosine similarity for a semantic (embedding) cache hit
+SEMANTIC_CACHE_BLOCK = 128  # The cached-embedding matrix grows by this many rows at a time
+NO_HANDOFF_CACHE_SIZE = 2048  # Max agent responses remembered as routing to nobody
+
+# Conversation context sent with user query routing: newest messages first, until the budget is spent
+ROUTING_CONTEXT_TOKENS = 400
+
+# Async routing micro-batches (see RouteBatcher)
+ROUTE_BATCH_WINDOW = 0.015  # Seconds to wait for more queries before sending a batch
+ROUTE_BATCH_SIZE = 8  # Max queries routed by one LLM call
+
+# Max concurrent LLM calls for IntentRouter.route_agent_responses_async
+ROUTER_CONCURRENCY = int(os.getenv('ROUTER_CONCURRENCY', '8'))
+
+# Speculative routing (see IntentRouter.route_user_query_speculative)
+# Agents launched on the expertise prior while the router runs; only the top guess, since
+# the caller can reuse just the first routed agent's answer and the rest would be paid for and discarded
+SPECULATIVE_AGENTS = 1
+
+# Compact user-query routing output: {"a": agent mask, "t": is_targeted, "c": confidence, "i": intent code}
+_COMPACT_INTENTS = {
+    'g': 'greeting',
+    't': 'team_activation',
+    'e': 'expertise_match',
+    'm': 'explicit_mention',
+}
+# Reasoning reported for compact decisions (the model no longer writes it), by intent
+_COMPACT_REASONING = {
+    'greeting': 'General greeting - Rahil provides team introduction',
+    'team_activation': 'Team activation requested - all agents respond',
+    'expertise_match': 'Matched query to agent expertise',
+    'explicit_mention': 'User explicitly addressed a team member',
+}
+
 
 def _get_agents():
     """Lazy import to avoid circular dependency"""
@@ -21,7 +133,12 @@ def _get_agents():
     return AGENTS
 
 
-@dataclass
+# __slots__ for the small record classes below (dataclass(slots=True) needs Python 3.10+;
+# on 3.9 they simply keep a per-instance __dict__)
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class RoutingDecision:
     """Represents a routing decision made by the LLM"""
     agent_ids: List[str]  # Which agents should respond
@@ -31,53 +148,252 @@ class RoutingDecision:
     context: Optional[str] = None  # Additional context
 
 
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
+class AgentExpertise:
+    """Routing expertise of one agent"""
+    agent_id: str
+    domains: Tuple[str, ...]
+    skills: Tuple[str, ...]
+    role: str
+
+
+# Routing expertise per agent, in prompt rendering order (immutable, built once at import
+# and shared by every router instance)
+AGENT_EXPERTISE: Tuple[AgentExpertise, ...] = (
+    AgentExpertise(
+        agent_id='rahil',
+        domains=('AI/ML', 'system architecture', 'deep learning', 'multi-agent systems', 'LLMs', 'orchestration', 'leadership'),
+        skills=('Python', 'PyTorch', 'GPT', 'system design', 'research'),
+        role='AI Architect & Orchestrator'
+    ),
+    AgentExpertise(
+        agent_id='mathew',
+        domains=('data engineering', 'cloud infrastructure', 'ETL pipelines', 'databases', 'big data', 'AWS', 'Azure'),
+        skills=('Python', 'SQL', 'Apache technologies', 'cloud platforms', 'data pipelines'),
+        role='Data Engineer'
+    ),
+    AgentExpertise(
+        agent_id='shreyas',
+        domains=('product management', 'strategy', 'planning', 'workflows', 'business', 'user experience', 'requirements'),
+        skills=('product strategy', 'roadmapping', 'stakeholder management', 'process optimization'),
+        role='Product Manager'
+    ),
+    AgentExpertise(
+        agent_id='siddarth',
+        domains=('software engineering', 'distributed systems', 'performance', 'code quality', 'architecture', 'scalability'),
+        skills=('Java', 'backend development', 'system performance', 'code optimization', 'debugging'),
+        role='Software Engineer'
+    ),
+)
+
+# Shared result for agent responses that mention nobody (the common case). agent_ids is
+# an empty tuple so the one instance can't be mutated by a caller; callers only iterate it
+_NO_MENTIONS_DECISION = RoutingDecision(
+    agent_ids=(),
+    reasoning='No mentions found',
+    is_targeted=False,
+    confidence=0.9
+)
+
+
 class IntentRouterError(Exception):
     """Raised when LLM routing fails"""
     pass
 
 
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _json_schema_format(name: str, properties: Dict[str, Any]) -> Dict[str, Any]:
+    """Strict json_schema response format (structured output) with every property required"""
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": name,
+            "strict": True,
+            "schema": {
+                "type": "object",
+                "properties": properties,
+                "required": list(properties),
+                "additionalProperties": False,
+            },
+        },
+    }
+
+
+def _raw_decode_object(text: str, start: int) -> Optional[Dict[str, Any]]:
+    """
+    Decode the JSON object starting at text[start] in one pass, ignoring what follows
+
+    Returns None if start is negative or no valid object starts there.
+    """
+    if start < 0:
+        return None
+    try:
+        return _JSON_DECODER.raw_decode(text, start)[0]
+    except ValueError:
+        return None
+
+
+def _json_loads(text: str) -> Any:
+    """
+    Parse JSON with orjson when available
+
+    Falls back to the stdlib parser on orjson errors so its extensions (NaN,
+    Infinity) are still accepted; both raise ValueError subclasses on bad input.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(text)
+
+
+def _context_snippet(content: str) -> str:
+    """Stable form of a context message: normalized newlines, 200-char cap, no trailing whitespace"""
+    return content.replace('\r\n', '\n').replace('\r', '\n')[:200].rstrip()
+
+
+_token_encoding = None
+
+
+def _count_tokens(text: str) -> int:
+    """Token count of text (cl100k_base via tiktoken, else a ~4 chars/token estimate)"""
+    global _token_encoding
+    if tiktoken is not None:
+        if _token_encoding is None:
+            _token_encoding = tiktoken.get_encoding('cl100k_base')
+        return len(_token_encoding.encode(text, disallowed_special=()))
+    return len(text) // 4 + 1
+
+
+def _is_word_char(char: str) -> bool:
+    """Whether char is a regex word character (\\w)"""
+    return char.isalnum() or char == '_'
+
+
+def _normalize_query(query: str) -> str:
+    """Normalize a query for cache lookups (lowercase, no punctuation, collapsed whitespace)"""
+    normalized = _WHITESPACE_RE.sub(' ', _PUNCTUATION_RE.sub('', query.lower())).strip()
+    # Queries made only of punctuation/emoji keep their raw form so they don't all collide
+    return normalized or query.strip()
+
+
 class IntentRouter:
     """
     Routes messages to appropriate agents using LLM analysis
     Supports both user-to-agent and agent-to-agent routing
     """
 
-    def __init__(self, openai_client):
+    def __init__(self, openai_client, verbose_reasoning: bool = False):
         """
         Initialize the intent router
 
         Args:
             openai_client: OpenAIClient instance for LLM calls
+            verbose_reasoning: Have the LLM write full JSON with free-text reasoning for
+                user query routing (debugging); by default it answers in the compact form
         """
         self.openai_client = openai_client
+        self.verbose_reasoning = verbose_reasoning
+        # Agent roster resolved once (the lazy import only matters at module import time)
+        self._agents = _get_agents()
+        self._agent_ids = frozenset(self._agents)
+        # Position of each agent in the compact output's agent mask: the order agents are
+        # listed in the prompt (rahil, mathew, shreyas, siddarth), then any without expertise
+        self._agent_order: Tuple[str, ...] = tuple(dict.fromkeys(
+            [expertise.agent_id for expertise in AGENT_EXPERTISE if expertise.agent_id in self._agents]
+            + list(self._agents)
+        ))
         self._build_agent_expertise_map()
 
+        # Created on first async call (needs a running event loop)
+        self._batcher: Optional['RouteBatcher'] = None
+
+        # (normalized query, history key) -> (embedding slot or None, mentions, decision)
+        self._routing_cache: 'OrderedDict[Tuple[str, bytes], Tuple[Optional[int], Set[str], RoutingDecision]]' = OrderedDict()
+        # Unit query embeddings of cached decisions as one contiguous float32 matrix, a row
+        # per slot (free slots are zeroed, so they never clear the threshold); semantic
+        # lookups are a single matrix-vector product
+        self._embed_matrix: Optional[np.ndarray] = None
+        self._slot_keys: List[Optional[Tuple[str, bytes]]] = []  # slot -> cache key
+        self._free_slots: List[int] = []
+        # Guards both caches: sync routing may run on worker threads alongside the event loop
+        self._cache_lock = threading.Lock()
+        # Digest of (agent id, response) -> empty decision, for agent responses the LLM
+        # found no active handoff in (only negatives are cached, so repeats skip the call)
+        self._no_handoff_cache: 'OrderedDict[bytes, RoutingDecision]' = OrderedDict()
+
     def _build_agent_expertise_map(self) -> None:
-        """Build a map of agent expertise for routing prompts"""
-        AGENTS = _get_agents()
-        self.agent_expertise = {
-            'rahil': {
-                'domains': ['AI/ML', 'system architecture', 'deep learning', 'multi-agent systems', 'LLMs', 'orchestration', 'leadership'],
-                'skills': ['Python', 'PyTorch', 'GPT', 'system design', 'research'],
-                'role': 'AI Architect & Orchestrator'
-            },
-            'mathew': {
-                'domains': ['data engineering', 'cloud infrastructure', 'ETL pipelines', 'databases', 'big data', 'AWS', 'Azure'],
-                'skills': ['Python', 'SQL', 'Apache technologies', 'cloud platforms', 'data pipelines'],
-                'role': 'Data Engineer'
-            },
-            'shreyas': {
-                'domains': ['product management', 'strategy', 'planning', 'workflows', 'business', 'user experience', 'requirements'],
-                'skills': ['product strategy', 'roadmapping', 'stakeholder management', 'process optimization'],
-                'role': 'Product Manager'
-            },
-            'siddarth': {
-                'domains': ['software engineering', 'distributed systems', 'performance', 'code quality', 'architecture', 'scalability'],
-                'skills': ['Java', 'backend development', 'system performance', 'code optimization', 'debugging'],
-                'role': 'Software Engineer'
-            }
+        """Attach the agent expertise map and pre-render the routing prompt blocks"""
+        AGENTS = self._agents
+        self.agent_expertise = AGENT_EXPERTISE
+
+        # The roster is static, so format the prompt blocks and system prompts once
+        self._agent_lines: Tuple[str, ...] = tuple(
+            f"- {expertise.agent_id} ({metadata['name']} - {metadata['title']}): "
+            f"{', '.join(expertise.domains[:5])}"
+            for expertise in self.agent_expertise
+            for metadata in (AGENTS[expertise.agent_id],)
+        )
+        self._agents_str = "\n".join(self._agent_lines)
+        self._team_members_str = "\n".join(
+            f"- {agent_id} ({metadata['name']} - {metadata['title']})"
+            for agent_id, metadata in AGENTS.items()
+        )
+        self._user_query_system_prompt = self._build_user_query_system_prompt()
+        # One agent response prompt for every agent (the responding agent is named in the
+        # user message), so all agent response calls share one cacheable prefix
+        self._agent_response_system_prompt = self._build_agent_response_system_prompt()
+        self._build_response_formats()
+
+        # Lowercased words of each agent's domains and skills, for the speculative prior
+        self._expertise_words: Dict[str, frozenset] = {
+            expertise.agent_id: frozenset(
+                word for term in expertise.domains + expertise.skills
+                for word in _WORD_RE.findall(term.lower()) if len(word) > 2
+            )
+            for expertise in self.agent_expertise
         }
 
+        # An agent's first name directly before a question mark, e.g. "thoughts, Mathew?"
+        first_names = sorted(
+            {metadata['name'].lower().split()[0] for metadata in AGENTS.values()}, key=len, reverse=True
+        )
+        self._question_address_re = re.compile(rf"\b(?:{'|'.join(first_names)})\s*\?", re.IGNORECASE)
+        # A message that opens by addressing one agent: a greeting plus a first name
+        # ("Hey Mathew ...") or a leading "Name," / "Name:" ("Rahil, can you ...")
+        self._opening_address_re = re.compile(
+            rf"\s*(?:(?:{'|'.join(_GREETINGS)})\s+({'|'.join(first_names)})\b|({'|'.join(first_names)})\s*[,:])",
+            re.IGNORECASE
+        )
+
+    def _build_response_formats(self) -> None:
+        """Build the structured-output schemas the routing calls request"""
+        agent_ids = {"type": "array", "items": {"type": "string", "enum": list(self._agent_order)}}
+        if self.verbose_reasoning:
+            self._user_query_response_format = _json_schema_format("user_query_routing", {
+                "agents": agent_ids,
+                "is_targeted": {"type": "boolean"},
+                "reasoning": {"type": "string"},
+                "confidence": {"type": "number"},
+                "intent": {"type": "string", "enum": list(_COMPACT_INTENTS.values())},
+            })
+        else:
+            self._user_query_response_format = _json_schema_format("user_query_routing", {
+                "a": {"type": "string"},
+                "t": {"type": "integer", "enum": [0, 1]},
+                "c": {"type": "number"},
+                "i": {"type": "string", "enum": list(_COMPACT_INTENTS)},
+            })
+        self._agent_response_format = _json_schema_format("agent_response_routing", {
+            "agents": agent_ids,
+            "is_targeted": {"type": "boolean"},
+            "reasoning": {"type": "string"},
+            "confidence": {"type": "number"},
+        })
+
     def route_user_query(
         self,
         user_query: str,
@@ -96,51 +412,645 @@ class IntentRouter:
         Raises:
             IntentRouterError: If LLM routing fails
         """
+        # Unambiguous queries (explicit mentions, team activation) skip the LLM entirely
+        decision = self._route_unambiguous(user_query)
+        if decision is not None:
+            return decision
+
+        # Exact, then semantic, cache lookup before paying for an LLM round-trip. A semantic
+        # hit also needs the same history, so mid-conversation the embedding request (a
+        # blocking round-trip before the LLM call) is skipped; only opening queries use it
+        cache_key = (_normalize_query(user_query), self._history_key(conversation_history))
+        cached = self._exact_cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        return self._route_uncached(
+            user_query, conversation_history, cache_key,
+            None if cache_key[1] else get_embedding(cache_key[0])
+        )
+
+    def _route_unambiguous(self, user_query: str) -> Optional[RoutingDecision]:
+        """
+        Route queries whose target is unambiguous without asking the LLM
+
+        Handles, in order: @mentions (those agents), a message that opens by
+        addressing one agent ("Hi Siddarth", "Rahil, ...") and names nobody
+        else, an explicit team activation phrase ("hear from everyone", "all
+        of you") with nobody named (all agents), and a message that is only a
+        greeting (Rahil). Anything else, including names used in passing
+        ("Mathew's pipelines are slow, why?"), returns None and goes to the LLM.
+
+        Args:
+            user_query: The user's message
+
+        Returns:
+            RoutingDecision, or None if the query needs LLM routing
+        """
+        mentions = MentionParser.extract_at_mentions(user_query)
+        named = None
+        if not mentions:
+            named = MentionParser.extract_name_references(user_query)
+            opening = self._opening_address_re.match(user_query) if named else None
+            if opening is not None:
+                addressed = MentionParser.extract_name_references(opening[1] or opening[2])
+                if named == addressed:
+                    mentions = addressed
+
+        if mentions:
+            agent_ids = [aid for aid in self._agent_order if aid in mentions]
+            return RoutingDecision(
+                agent_ids=agent_ids,
+                reasoning='User explicitly addressed ' + ', '.join(
+                    self._agents[aid]['name'] for aid in agent_ids
+                ),
+                is_targeted=True,
+                confidence=1.0,
+                context='explicit_mention'
+            )
+
+        if not named and _TEAM_ACTIVATION_RE.search(user_query):
+            return RoutingDecision(
+                agent_ids=list(self._agent_order),
+                reasoning=_COMPACT_REASONING['team_activation'],
+                is_targeted=True,
+                confidence=1.0,
+                context='team_activation'
+            )
+
+        if _GREETING_RE.fullmatch(user_query):
+            return RoutingDecision(
+                agent_ids=['rahil'],
+                reasoning=_COMPACT_REASONING['greeting'],
+                is_targeted=False,
+                confidence=1.0,
+                context='greeting'
+            )
+        return None
+
+    def route_user_queries(
+        self,
+        user_queries: List[str],
+        conversation_history: Optional[List[Dict[str, Any]]] = None
+    ) -> List[RoutingDecision]:
+        """
+        Route several user queries that share the same conversation context
+
+        Queries missing from the exact cache are embedded together in one
+        embedding request instead of one request per query (only without
+        conversation context, see route_user_query).
+
+        Args:
+            user_queries: The user messages to route
+            conversation_history: Recent conversation context (shared by all queries)
+
+        Returns:
+            One RoutingDecision per query, in order
+
+        Raises:
+            IntentRouterError: If LLM routing fails
+        """
+        history_key = self._history_key(conversation_history)
+        cache_keys = [(_normalize_query(query), history_key) for query in user_queries]
+        unambiguous = [self._route_unambiguous(query) for query in user_queries]
+
+        to_embed = []
+        if not history_key:
+            with self._cache_lock:
+                to_embed = list(dict.fromkeys(
+                    key[0] for key, decision in zip(cache_keys, unambiguous)
+                    if decision is None and key not in self._routing_cache
+                ))
+        embeddings = dict(zip(to_embed, get_embeddings(to_embed)))
+
+        decisions = []
+        for user_query, cache_key, decision in zip(user_queries, cache_keys, unambiguous):
+            if decision is not None:
+                decisions.append(decision)
+                continue
+            # Re-check the exact cache: an earlier query in the batch may have filled it
+            cached = self._exact_cache_get(cache_key)
+            if cached is not None:
+                decisions.append(cached)
+                continue
+            decisions.append(self._route_uncached(
+                user_query, conversation_history, cache_key, embeddings.get(cache_key[0])
+            ))
+        return decisions
+
+    def _route_uncached(
+        self,
+        user_query: str,
+        conversation_history: Optional[List[Dict[str, Any]]],
+        cache_key: Tuple[str, bytes],
+        query_embedding: Optional[np.ndarray]
+    ) -> RoutingDecision:
+        """
+        Route a query that missed the exact cache: semantic cache, then the LLM
+
+        Args:
+            user_query: The user's message
+            conversation_history: Recent conversation context
+            cache_key: Exact-cache key (normalized query, history key)
+            query_embedding: Raw embedding of the normalized query, or None
+
+        Returns:
+            RoutingDecision with selected agents
+        """
+        mentions, query_embedding, cached_decision = self._semantic_cache_check(
+            user_query, cache_key, query_embedding
+        )
+        if cached_decision is not None:
+            return cached_decision
+
         try:
             # Build routing prompt (LLM handles ALL intent detection semantically)
             routing_prompt = self._build_user_query_routing_prompt(user_query, conversation_history)
 
-            # Call LLM for routing decision
-            messages = [
-                {
-                    "role": "system",
-                    "content": "You are an expert routing system for a multi-agent team. Analyze queries and determine which team members should respond based on their expertise."
-                },
-                {
-                    "role": "user",
-                    "content": routing_prompt
-                }
-            ]
-
-            # Get LLM response (non-streaming for routing)
-            response_chunks = []
-            for chunk in self.openai_client.generate(messages, stream=False):
-                response_chunks.append(chunk)
-
-            response_text = "".join(response_chunks)
+            # Get LLM response (streamed, stopped as soon as the JSON object is complete)
+            response_text = self._generate_routing_text(
+                self._user_query_messages(routing_prompt), self._user_query_response_format
+            )
 
             # Parse JSON response
             routing_data = self._parse_routing_response(response_text)
+            decision, fell_back = self._decision_from_routing_data(routing_data)
 
-            # Validate agent IDs
-            AGENTS = _get_agents()
-            valid_agents = [aid for aid in routing_data['agents'] if aid in AGENTS]
+        except Exception as e:
+            raise IntentRouterError(f"LLM routing failed: {str(e)}")
 
-            # Fallback to all agents if LLM returns no valid agents
-            if not valid_agents:
-                print(f"⚠️ LLM returned no valid agents: {routing_data['agents']}. Falling back to all agents.")
-                valid_agents = list(AGENTS.keys())
+        # Only cache real LLM decisions, not the all-agents fallback
+        if not fell_back:
+            self._cache_decision(cache_key, query_embedding, mentions, decision)
+        return decision
 
-            return RoutingDecision(
-                agent_ids=valid_agents,
-                reasoning=routing_data.get('reasoning', 'No reasoning provided (fallback to all agents)') if not routing_data.get('agents') else routing_data.get('reasoning', 'No reasoning provided'),
-                is_targeted=routing_data.get('is_targeted', False),
-                confidence=routing_data.get('confidence', 0.5),  # Lower confidence for fallback
-                context=routing_data.get('intent')  # Pass intent from LLM ("greeting", "team_activation", "expertise_match", "explicit_mention")
+    async def route_user_query_async(
+        self,
+        user_query: str,
+        conversation_history: Optional[List[Dict[str, Any]]] = None
+    ) -> RoutingDecision:
+        """
+        Async version of route_user_query that batches concurrent queries
+
+        Fast paths and the exact cache are checked inline; everything else is
+        queued on a RouteBatcher so queries arriving within ROUTE_BATCH_WINDOW
+        share one embedding request and one LLM call.
+
+        Args:
+            user_query: The user's message
+            conversation_history: Recent conversation context
+
+        Returns:
+            RoutingDecision with selected agents
+
+        Raises:
+            IntentRouterError: If LLM routing fails
+        """
+        decision = self._route_unambiguous(user_query)
+        if decision is not None:
+            return decision
+
+        cache_key = (_normalize_query(user_query), self._history_key(conversation_history))
+        cached = self._exact_cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        if self._batcher is None:
+            self._batcher = RouteBatcher(self)
+        return await self._batcher.submit(user_query, conversation_history, cache_key)
+
+    async def route_user_query_speculative(
+        self,
+        user_query: str,
+        conversation_history: Optional[List[Dict[str, Any]]],
+        launch_agent_fn: Callable[[str], Awaitable[Any]],
+        max_agents: int = SPECULATIVE_AGENTS
+    ) -> Tuple[RoutingDecision, Dict[str, 'asyncio.Task']]:
+        """
+        Route a user query while the most likely agents already start answering
+
+        Queries that need the LLM launch launch_agent_fn(agent_id) as a task for
+        up to max_agents agents ranked by a cheap expertise prior, then await
+        the router. Tasks for agents the router did not select are cancelled;
+        the rest are returned for the caller to await (or cancel, if it can't
+        use them). Fast-path and cached queries route instantly and launch nothing.
+
+        Args:
+            user_query: The user's message
+            conversation_history: Recent conversation context
+            launch_agent_fn: Called with an agent id, returns the awaitable to run speculatively
+            max_agents: Max agents to launch before the router returns
+
+        Returns:
+            (RoutingDecision, {agent_id: still-running speculative task})
+
+        Raises:
+            IntentRouterError: If LLM routing fails
+        """
+        decision = self._route_unambiguous(user_query)
+        if decision is None:
+            decision = self._exact_cache_get(
+                (_normalize_query(user_query), self._history_key(conversation_history))
             )
+        if decision is not None:
+            return decision, {}
 
-        except Exception as e:
-            raise IntentRouterError(f"LLM routing failed: {str(e)}")
+        tasks = {
+            agent_id: asyncio.ensure_future(launch_agent_fn(agent_id))
+            for agent_id in self._agent_prior(user_query)[:max_agents]
+        }
+        try:
+            decision = await self.route_user_query_async(user_query, conversation_history)
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            raise
+
+        selected = set(decision.agent_ids)
+        for agent_id in [aid for aid in tasks if aid not in selected]:
+            tasks.pop(agent_id).cancel()
+        return decision, tasks
+
+    def _agent_prior(self, user_query: str) -> List[str]:
+        """
+        Rank agents by how many of their expertise words the query contains
+
+        Args:
+            user_query: The user's message
+
+        Returns:
+            Agent ids with at least one matching word, best first (ties in roster order)
+        """
+        query_words = set(_WORD_RE.findall(user_query.lower()))
+        scores = {
+            agent_id: len(words & query_words) for agent_id, words in self._expertise_words.items()
+        }
+        return sorted((aid for aid, score in scores.items() if score), key=lambda aid: -scores[aid])
+
+    async def _route_batch_async(
+        self,
+        batch: List[Tuple[str, Optional[List[Dict[str, Any]]], Tuple[str, bytes]]]
+    ) -> List[Any]:
+        """
+        Route a batch of queued queries: one embedding request (for queries without
+        conversation context, see route_user_query), then one LLM call for the misses
+
+        Args:
+            batch: (user query, conversation history, cache key) per queued query
+
+        Returns:
+            Per query, in order: its RoutingDecision, or the IntentRouterError it failed with
+        """
+        texts = list(dict.fromkeys(cache_key[0] for _, _, cache_key in batch if not cache_key[1]))
+        embeddings = dict(zip(texts, await asyncio.to_thread(get_embeddings, texts))) if texts else {}
+
+        results: List[Any] = [None] * len(batch)
+        pending = []
+        for index, (user_query, conversation_history, cache_key) in enumerate(batch):
+            cached = self._exact_cache_get(cache_key)
+            if cached is not None:
+                results[index] = cached
+                continue
+            mentions, query_embedding, cached_decision = self._semantic_cache_check(
+                user_query, cache_key, embeddings.get(cache_key[0])
+            )
+            if cached_decision is not None:
+                results[index] = cached_decision
+                continue
+            routing_prompt = self._build_user_query_routing_prompt(user_query, conversation_history)
+            pending.append((index, cache_key, query_embedding, mentions, routing_prompt))
+
+        if not pending:
+            return results
+
+        routed = await self._llm_route_many([item[4] for item in pending])
+        for (index, cache_key, query_embedding, mentions, _), routing_data in zip(pending, routed):
+            if isinstance(routing_data, Exception):
+                results[index] = IntentRouterError(f"LLM routing failed: {str(routing_data)}")
+                continue
+            decision, fell_back = self._decision_from_routing_data(routing_data)
+            if not fell_back:
+                self._cache_decision(cache_key, query_embedding, mentions, decision)
+            results[index] = decision
+        return results
+
+    async def _llm_route_many(self, routing_prompts: List[str]) -> List[Any]:
+        """
+        Get routing data for several routing prompts, in one LLM call when possible
+
+        Falls back to one concurrent call per prompt if the batched response
+        can't be parsed.
+
+        Args:
+            routing_prompts: Per-message routing prompts (see _build_user_query_routing_prompt)
+
+        Returns:
+            Per prompt, in order: parsed routing data, or the exception it failed with
+        """
+        if len(routing_prompts) > 1:
+            try:
+                response_text = await self.openai_client.generate_async(
+                    self._user_query_messages(self._build_batch_routing_prompt(routing_prompts))
+                )
+                return self._parse_batch_routing_response(response_text, len(routing_prompts))
+            except IntentRouterError as e:
+                print(f"⚠️ Batched routing failed ({e}). Routing {len(routing_prompts)} messages separately.")
+
+        response_texts = await asyncio.gather(*(
+            self.openai_client.generate_async(
+                self._user_query_messages(routing_prompt), self._user_query_response_format
+            )
+            for routing_prompt in routing_prompts
+        ))
+        routed: List[Any] = []
+        for response_text in response_texts:
+            try:
+                routed.append(self._parse_routing_response(response_text))
+            except IntentRouterError as e:
+                routed.append(e)
+        return routed
+
+    def _semantic_cache_check(
+        self,
+        user_query: str,
+        cache_key: Tuple[str, bytes],
+        query_embedding: Optional[np.ndarray]
+    ) -> Tuple[Set[str], Optional[np.ndarray], Optional[RoutingDecision]]:
+        """
+        Prepare a query that missed the exact cache and look it up semantically
+
+        Args:
+            user_query: The user's message
+            cache_key: Exact-cache key (normalized query, history key)
+            query_embedding: Raw embedding of the normalized query, or None
+
+        Returns:
+            (IDs of agents named anywhere in the query, unit embedding or None, cached decision or None)
+        """
+        # Any reference to an agent guards the semantic cache, not just direct address:
+        # "What is Mathew's experience?" must never reuse "What is Rahil's experience?"
+        mentions = MentionParser.extract_name_references(user_query)
+        if query_embedding is None:
+            return mentions, None, None
+        query_embedding = query_embedding / (np.linalg.norm(query_embedding) or 1.0)
+        return mentions, query_embedding, self._semantic_cache_lookup(cache_key[1], query_embedding, mentions)
+
+    def _generate_routing_text(
+        self,
+        messages: List[Dict[str, str]],
+        response_format: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Stream a routing response and stop once its first JSON object is complete
+
+        Tracks brace depth (ignoring braces inside JSON strings) from the first
+        '{' and closes the stream when it returns to zero, so any prose the model
+        appends after the JSON is never generated. Models that don't stream
+        yield the whole response at once, which is returned as is.
+
+        Args:
+            messages: Chat messages for the routing call
+            response_format: Structured-output schema to request, if any
+
+        Returns:
+            Response text up to the end of the first JSON object (or all of it)
+        """
+        chunks = []
+        depth = 0
+        started = in_string = escaped = False
+        stream = self.openai_client.generate(messages, stream=True, response_format=response_format)
+        try:
+            for chunk in stream:
+                chunks.append(chunk)
+                for char in chunk:
+                    if in_string:
+                        if escaped:
+                            escaped = False
+                        elif char == '\\':
+                            escaped = True
+                        elif char == '"':
+                            in_string = False
+                    elif char == '{':
+                        depth += 1
+                        started = True
+                    elif not started:
+                        continue
+                    elif char == '"':
+                        in_string = True
+                    elif char == '}':
+                        depth -= 1
+                        if depth == 0:
+                            return "".join(chunks)
+        finally:
+            # Closing the generator closes the HTTP stream, cancelling the rest of the completion
+            stream.close()
+        return "".join(chunks)
+
+    def _user_query_messages(self, routing_prompt: str) -> List[Dict[str, str]]:
+        """
+        Chat messages for a user query routing call
+
+        Static instructions go in the system message so every call shares a
+        byte-identical prefix (provider prompt caching).
+        """
+        return [
+            {
+                "role": "system",
+                "content": self._user_query_system_prompt
+            },
+            {
+                "role": "user",
+                "content": routing_prompt
+            }
+        ]
+
+    def _decision_from_routing_data(self, routing_data: Dict[str, Any]) -> Tuple[RoutingDecision, bool]:
+        """
+        Build a RoutingDecision from parsed user query routing data
+
+        Args:
+            routing_data: Validated routing data (see _parse_routing_response)
+
+        Returns:
+            (decision, whether it fell back to all agents because none were valid)
+        """
+        # Validate agent IDs
+        valid_agents = self._valid_agent_ids(routing_data['agents'])
+
+        # Fallback to all agents if LLM returns no valid agents
+        fell_back = not valid_agents
+        if fell_back:
+            print(f"⚠️ LLM returned no valid agents: {routing_data['agents']}. Falling back to all agents.")
+            valid_agents = list(self._agents)
+
+        decision = RoutingDecision(
+            agent_ids=valid_agents,
+            reasoning=routing_data.get('reasoning', 'No reasoning provided (fallback to all agents)') if not routing_data.get('agents') else routing_data.get('reasoning', 'No reasoning provided'),
+            is_targeted=routing_data.get('is_targeted', False),
+            confidence=routing_data.get('confidence', 0.5),  # Lower confidence for fallback
+            context=routing_data.get('intent')  # Pass intent from LLM ("greeting", "team_activation", "expertise_match", "explicit_mention")
+        )
+        return decision, fell_back
+
+    def _valid_agent_ids(self, agent_ids: List[str], exclude: Optional[str] = None) -> List[str]:
+        """
+        Filter LLM-returned agent IDs down to known agents
+
+        Args:
+            agent_ids: Agent IDs from the routing response
+            exclude: Agent ID to drop (the agent who just responded), if any
+
+        Returns:
+            Known agent IDs in the order returned, without duplicates
+        """
+        valid = self._agent_ids.intersection(agent_ids)
+        if exclude is not None:
+            valid = valid - {exclude}
+        if not valid:
+            return []
+        return [aid for aid in dict.fromkeys(agent_ids) if aid in valid]
+
+    @staticmethod
+    def _history_key(conversation_history: Optional[List[Dict[str, Any]]]) -> bytes:
+        """
+        Fixed-size key for the part of the history the routing prompt uses (its context lines)
+
+        A 16-byte BLAKE2b digest over the length-prefixed lines, so cache keys stay
+        small and cheap to hash/compare however long the context is. b'' when empty.
+        """
+        context_lines = IntentRouter._format_context(conversation_history)
+        if not context_lines:
+            return b''
+        digest = hashlib.blake2b(digest_size=16)
+        for line in context_lines:
+            encoded = line.encode('utf-8', 'surrogatepass')
+            digest.update(len(encoded).to_bytes(4, 'little'))
+            digest.update(encoded)
+        return digest.digest()
+
+    @staticmethod
+    def _format_context(conversation_history: Optional[List[Dict[str, Any]]]) -> List[str]:
+        """
+        Format the most recent user/agent messages as prompt context lines
+
+        Messages are taken newest first until the next line would push the context
+        past ROUTING_CONTEXT_TOKENS, then returned oldest first, so prompt size stays
+        bounded however long the session gets. Each message is normalized (newlines,
+        200-char cap, trailing whitespace) so the same context always produces
+        byte-identical prompt text.
+        """
+        context_parts = []
+        budget = ROUTING_CONTEXT_TOKENS
+        for msg in reversed(conversation_history or []):
+            role = msg.get('role', 'unknown')
+            if role == 'user':
+                line = f"User: {_context_snippet(msg.get('content', ''))}"
+            elif role == 'agent':
+                agent_name = msg.get('agent', 'Agent')
+                line = f"{agent_name}: {_context_snippet(msg.get('content', ''))}"
+            else:
+                continue
+            budget -= _count_tokens(line) + 1  # +1 for the joining newline
+            if budget < 0:
+                break
+            context_parts.append(line)
+        context_parts.reverse()
+        return context_parts
+
+    @staticmethod
+    def _copy_decision(decision: RoutingDecision) -> RoutingDecision:
+        """Copy a cached decision so callers can't mutate the cached agent list"""
+        return replace(decision, agent_ids=list(decision.agent_ids))
+
+    def _semantic_cache_lookup(
+        self,
+        history_key: bytes,
+        query_embedding: np.ndarray,
+        mentions: Set[str]
+    ) -> Optional[RoutingDecision]:
+        """
+        Find a cached decision for a semantically equivalent query
+
+        Every cached embedding is scored with one matrix-vector product; the
+        best-scoring entry above SEMANTIC_CACHE_THRESHOLD with the same
+        conversation context and the same agents named wins, so "Hi Mathew"
+        never reuses "Hi Rahil" and "Tell me about Siddarth's background"
+        never reuses the answer for Shreyas.
+
+        Args:
+            history_key: Key of the recent conversation context
+            query_embedding: Unit-normalized embedding of the normalized query
+            mentions: IDs of agents named anywhere in the query (see MentionParser.extract_name_references)
+
+        Returns:
+            Copy of the best matching cached decision, or None
+        """
+        query_embedding = query_embedding.astype(np.float32)
+        with self._cache_lock:
+            if self._embed_matrix is None:
+                return None
+
+            similarities = self._embed_matrix[:len(self._slot_keys)] @ query_embedding
+            hits = np.flatnonzero(similarities >= SEMANTIC_CACHE_THRESHOLD)
+            for slot in hits[np.argsort(-similarities[hits], kind='stable')]:
+                key = self._slot_keys[slot]
+                _, cached_mentions, decision = self._routing_cache[key]
+                if key[1] == history_key and cached_mentions == mentions:
+                    self._routing_cache.move_to_end(key)
+                    return self._copy_decision(decision)
+        return None
+
+    def _exact_cache_get(self, cache_key: Tuple[str, bytes]) -> Optional[RoutingDecision]:
+        """Copy of the decision cached under exactly this key (marked most recently used), or None"""
+        with self._cache_lock:
+            cached = self._routing_cache.get(cache_key)
+            if cached is None:
+                return None
+            self._routing_cache.move_to_end(cache_key)
+            return self._copy_decision(cached[2])
+
+    def _cache_decision(
+        self,
+        cache_key: Tuple[str, bytes],
+        query_embedding: Optional[np.ndarray],
+        mentions: Set[str],
+        decision: RoutingDecision
+    ) -> None:
+        """Store a routing decision, evicting the least recently used entry when full"""
+        decision = self._copy_decision(decision)
+        with self._cache_lock:
+            previous = self._routing_cache.get(cache_key)
+            if previous is not None:
+                self._release_embedding_slot(previous[0])
+            slot = None if query_embedding is None else self._store_embedding(cache_key, query_embedding)
+            self._routing_cache[cache_key] = (slot, mentions, decision)
+            self._routing_cache.move_to_end(cache_key)
+            while len(self._routing_cache) > ROUTING_CACHE_SIZE:
+                _, (evicted_slot, _, _) = self._routing_cache.popitem(last=False)
+                self._release_embedding_slot(evicted_slot)
+
+    def _store_embedding(self, cache_key: Tuple[str, bytes], query_embedding: np.ndarray) -> int:
+        """Write a unit embedding into a free matrix row (growing the matrix if needed), return its slot; needs _cache_lock"""
+        if self._free_slots:
+            slot = self._free_slots.pop()
+        else:
+            slot = len(self._slot_keys)
+            self._slot_keys.append(None)
+            if self._embed_matrix is None or slot == len(self._embed_matrix):
+                grown = np.zeros((slot + SEMANTIC_CACHE_BLOCK, query_embedding.shape[0]), dtype=np.float32)
+                if self._embed_matrix is not None:
+                    grown[:slot] = self._embed_matrix
+                self._embed_matrix = grown
+        self._embed_matrix[slot] = query_embedding
+        self._slot_keys[slot] = cache_key
+        return slot
+
+    def _release_embedding_slot(self, slot: Optional[int]) -> None:
+        """Zero and free an embedding slot (no-op for entries stored without an embedding); needs _cache_lock"""
+        if slot is not None:
+            self._embed_matrix[slot] = 0.0
+            self._slot_keys[slot] = None
+            self._free_slots.append(slot)
 
     def route_agent_response(
         self,
@@ -160,90 +1070,156 @@ class IntentRouter:
         Raises:
             IntentRouterError: If LLM routing fails
         """
+        decision, digest = self._route_agent_response_without_llm(agent_id, agent_response)
+        if decision is not None:
+            return decision
+
         try:
-            # Build routing prompt for agent response analysis
-            routing_prompt = self._build_agent_response_routing_prompt(agent_id, agent_response)
-
-            # Call LLM for routing decision
-            messages = [
-                {
-                    "role": "system",
-                    "content": "You are an expert at analyzing agent responses for @mentions and delegation patterns. Identify which team members are being asked to respond or contribute."
-                },
-                {
-                    "role": "user",
-                    "content": routing_prompt
-                }
-            ]
+            # Get LLM response (streamed, stopped as soon as the JSON object is complete)
+            response_text = self._generate_routing_text(
+                self._agent_response_messages(agent_id, agent_response), self._agent_response_format
+            )
+            return self._agent_response_decision(agent_id, digest, response_text)
+        except Exception as e:
+            raise IntentRouterError(f"Agent response routing failed: {str(e)}")
 
-            # Get LLM response (non-streaming)
-            response_chunks = []
-            for chunk in self.openai_client.generate(messages, stream=False):
-                response_chunks.append(chunk)
+    async def route_agent_response_async(
+        self,
+        agent_id: str,
+        agent_response: str
+    ) -> RoutingDecision:
+        """
+        Async version of route_agent_response (the LLM call doesn't block the event loop)
 
-            response_text = "".join(response_chunks)
+        Args:
+            agent_id: ID of the agent who responded
+            agent_response: The agent's response text
 
-            # Parse JSON response
-            routing_data = self._parse_routing_response(response_text)
+        Returns:
+            RoutingDecision with agents to route to next (empty if no mentions)
 
-            # Validate agent IDs (exclude the agent who just responded)
-            AGENTS = _get_agents()
-            valid_agents = [
-                aid for aid in routing_data['agents']
-                if aid in AGENTS and aid != agent_id
-            ]
+        Raises:
+            IntentRouterError: If LLM routing fails
+        """
+        decision, digest = self._route_agent_response_without_llm(agent_id, agent_response)
+        if decision is not None:
+            return decision
 
-            return RoutingDecision(
-                agent_ids=valid_agents,
-                reasoning=routing_data.get('reasoning', 'No mentions found'),
-                is_targeted=len(valid_agents) > 0,
-                confidence=routing_data.get('confidence', 0.9)
+        try:
+            response_text = await self.openai_client.generate_async(
+                self._agent_response_messages(agent_id, agent_response), self._agent_response_format
             )
-
+            return self._agent_response_decision(agent_id, digest, response_text)
         except Exception as e:
             raise IntentRouterError(f"Agent response routing failed: {str(e)}")
 
-    def _build_user_query_routing_prompt(
+    async def route_agent_responses_async(
         self,
-        user_query: str,
-        conversation_history: Optional[List[Dict[str, Any]]] = None
-    ) -> str:
-        """Build prompt for user query routing"""
-        # Format conversation context
-        context_str = ""
-        if conversation_history:
-            recent_context = conversation_history[-3:]  # Last 3 messages
-            context_parts = []
-            for msg in recent_context:
-                role = msg.get('role', 'unknown')
-                if role == 'user':
-                    context_parts.append(f"User: {msg.get('content', '')[:200]}")
-                elif role == 'agent':
-                    agent_name = msg.get('agent', 'Agent')
-                    context_parts.append(f"{agent_name}: {msg.get('content', '')[:200]}")
-            context_str = "\n".join(context_parts)
-
-        # Format agent expertise
-        AGENTS = _get_agents()
-        agent_list = []
-        for agent_id, expertise in self.agent_expertise.items():
-            agent_name = AGENTS[agent_id]['name']
-            agent_title = AGENTS[agent_id]['title']
-            domains = ", ".join(expertise['domains'][:5])
-            agent_list.append(f"- {agent_id} ({agent_name} - {agent_title}): {domains}")
-
-        agents_str = "\n".join(agent_list)
+        responses: List[Tuple[str, str]]
+    ) -> List[Any]:
+        """
+        Route several agent responses concurrently
+
+        At most ROUTER_CONCURRENCY LLM calls run at once, so routing N responses
+        takes about as long as the slowest call instead of the sum of all of them.
+
+        Args:
+            responses: (agent ID, response text) pairs
+
+        Returns:
+            Per pair, in order: its RoutingDecision, or the IntentRouterError it failed with
+        """
+        semaphore = asyncio.Semaphore(ROUTER_CONCURRENCY)
+
+        async def route(agent_id: str, agent_response: str) -> RoutingDecision:
+            async with semaphore:
+                return await self.route_agent_response_async(agent_id, agent_response)
+
+        return await asyncio.gather(
+            *(route(agent_id, agent_response) for agent_id, agent_response in responses),
+            return_exceptions=True
+        )
+
+    def _route_agent_response_without_llm(
+        self,
+        agent_id: str,
+        agent_response: str
+    ) -> Tuple[Optional[RoutingDecision], bytes]:
+        """
+        Decide an agent response without the LLM where possible
+
+        Args:
+            agent_id: ID of the agent who responded
+            agent_response: The agent's response text
+
+        Returns:
+            (decision or None if the LLM is needed, no-handoff cache key of the response)
+        """
+        # Only ask the LLM (passive vs active mention) when another agent is actually
+        # mentioned, addressed with a question ("what do you think, Shreyas?") or the
+        # response uses delegation language; otherwise nothing to route
+        other_mentions = MentionParser.extract_mentions(agent_response) - {agent_id}
+        if (not other_mentions
+                and not self._question_address_re.search(agent_response)
+                and not _DELEGATION_RE.search(agent_response)):
+            return _NO_MENTIONS_DECISION, b''
+
+        digest = hashlib.blake2b(
+            f"{agent_id}\0{agent_response}".encode('utf-8', 'surrogatepass'), digest_size=16
+        ).digest()
+        with self._cache_lock:
+            cached = self._no_handoff_cache.get(digest)
+            if cached is not None:
+                self._no_handoff_cache.move_to_end(digest)
+                return self._copy_decision(cached), digest
+        return None, digest
+
+    def _agent_response_messages(self, agent_id: str, agent_response: str) -> List[Dict[str, str]]:
+        """Chat messages for an agent response routing call (static instructions first, agent + response last)"""
+        return [
+            {
+                "role": "system",
+                "content": self._agent_response_system_prompt
+            },
+            {
+                "role": "user",
+                "content": self._build_agent_response_routing_prompt(agent_id, agent_response)
+            }
+        ]
+
+    def _agent_response_decision(self, agent_id: str, digest: bytes, response_text: str) -> RoutingDecision:
+        """
+        Build the decision for an agent response from the LLM's answer
+
+        Empty decisions are remembered in the no-handoff cache under digest.
+        """
+        routing_data = self._parse_routing_response(response_text)
+
+        # Validate agent IDs (exclude the agent who just responded)
+        valid_agents = self._valid_agent_ids(routing_data['agents'], exclude=agent_id)
+
+        decision = RoutingDecision(
+            agent_ids=valid_agents,
+            reasoning=routing_data.get('reasoning', 'No mentions found'),
+            is_targeted=len(valid_agents) > 0,
+            confidence=routing_data.get('confidence', 0.9)
+        )
+        if not valid_agents:
+            with self._cache_lock:
+                self._no_handoff_cache[digest] = self._copy_decision(decision)
+                while len(self._no_handoff_cache) > NO_HANDOFF_CACHE_SIZE:
+                    self._no_handoff_cache.popitem(last=False)
+        return decision
+
+    def _build_user_query_system_prompt(self) -> str:
+        """Build the static system prompt for user query routing (instructions + team)"""
+        agents_str = self._agents_str
 
         prompt = f"""You are an expert routing system for a multi-agent team. Analyze the user's message semantically to detect intent and route appropriately.
 
 Team Members:
 {agents_str}
 
-Recent Conversation Context:
-{context_str if context_str else "No recent context"}
-
-User Message: "{user_query}"
-
 # ROUTING PRIORITY (Check in this exact order)
 
 ## 🔥 PRIORITY 1: EXPLICIT MENTIONS (HIGHEST PRIORITY - Check FIRST!)
@@ -311,48 +1287,111 @@ Respond:
     "intent": "expertise_match"
 }}
 
-# OUTPUT FORMAT
+{self._build_user_query_output_format()}
+
+Valid agent IDs: rahil, mathew, shreyas, siddarth
+
+IMPORTANT: Detect intent semantically, not by exact string matching. Support ANY language."""
+
+        return prompt
+
+    def _build_user_query_output_format(self) -> str:
+        """Build the OUTPUT FORMAT section of the user query system prompt"""
+        if self.verbose_reasoning:
+            return """# OUTPUT FORMAT
 Respond ONLY with valid JSON:
-{{
+{
     "agents": ["agent_id1", "agent_id2"],
     "is_targeted": true/false,
     "reasoning": "Brief explanation (1-2 sentences)",
     "confidence": 0.0-1.0,
     "intent": "greeting" | "team_activation" | "expertise_match" | "explicit_mention"
-}}
+}"""
 
-Valid agent IDs: rahil, mathew, shreyas, siddarth
+        order = ", ".join(self._agent_order)
+        only_first = "x" + "-" * (len(self._agent_order) - 1)
+        return f"""# OUTPUT FORMAT
+The responses above show each decision's fields. Do NOT write them out; encode the same decision compactly, with no reasoning.
+Respond ONLY with valid JSON:
+{{"a": "<agent mask>", "t": 0 or 1, "c": 0.0-1.0, "i": "<intent code>"}}
 
-IMPORTANT: Detect intent semantically, not by exact string matching. Support ANY language."""
+- a: one character per agent, in this order: {order}. "x" if the agent should respond, "-" otherwise (e.g. "{only_first}" = {self._agent_order[0]} only, "{"x" * len(self._agent_order)}" = whole team)
+- t: is_targeted (1 = true, 0 = false)
+- c: confidence
+- i: intent code: g = greeting, t = team_activation, e = expertise_match, m = explicit_mention"""
 
-        return prompt
+    @staticmethod
+    def _build_batch_routing_prompt(routing_prompts: List[str]) -> str:
+        """Combine several per-message routing prompts into one batched request"""
+        count = len(routing_prompts)
+        header = (
+            f"Route each of the following {count} messages independently, using the rules above.\n"
+            f"Respond ONLY with a JSON array of {count} objects in the output format above, "
+            f"one per message, in the same order."
+        )
+        sections = [
+            f"### Message {number}\n{routing_prompt}"
+            for number, routing_prompt in enumerate(routing_prompts, 1)
+        ]
+        return "\n\n".join([header] + sections)
+
+    def _expand_compact_routing(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Expand a compact routing response into the verbose routing fields
 
-    def _build_agent_response_routing_prompt(
+        Args:
+            data: Parsed compact response ({"a": ..., "t": ..., "c": ..., "i": ...})
+
+        Returns:
+            Routing data with agents, is_targeted, confidence, intent and reasoning
+
+        Raises:
+            ValueError: If the agent mask is malformed
+        """
+        mask = data['a']
+        if not isinstance(mask, str) or len(mask) != len(self._agent_order):
+            raise ValueError(f"'a' must be a {len(self._agent_order)}-character agent mask")
+
+        intent = _COMPACT_INTENTS.get(data.get('i'), data.get('i'))
+        routing_data = {
+            'agents': [aid for aid, flag in zip(self._agent_order, mask) if flag != '-'],
+            'is_targeted': bool(data.get('t', False)),
+            'confidence': data.get('c', 0.5),
+            'intent': intent,
+        }
+        if intent in _COMPACT_REASONING:
+            routing_data['reasoning'] = _COMPACT_REASONING[intent]
+        return routing_data
+
+    def _build_user_query_routing_prompt(
         self,
-        agent_id: str,
-        agent_response: str
+        user_query: str,
+        conversation_history: Optional[List[Dict[str, Any]]] = None
     ) -> str:
-        """Build prompt for agent response analysis (detecting @mentions)"""
-        AGENTS = _get_agents()
-        agent_name = AGENTS[agent_id]['name']
+        """
+        Build the per-request part of the user query routing prompt
 
-        # Format other agents
-        other_agents = []
-        for aid, metadata in AGENTS.items():
-            if aid != agent_id:
-                other_agents.append(f"- {aid} ({metadata['name']} - {metadata['title']})")
+        Dynamic content only, context first and the query last; the static
+        instructions live in the system prompt. With no context the section is
+        omitted entirely.
+        """
+        context_str = "\n".join(self._format_context(conversation_history))
+        query_str = f'User Message: "{user_query}"'
 
-        other_agents_str = "\n".join(other_agents)
+        if not context_str:
+            return query_str
+        return f"Recent Conversation Context:\n{context_str}\n\n{query_str}"
 
-        prompt = f"""Analyze this agent's response to determine if they are ACTIVELY delegating or requesting another agent to respond.
+    def _build_agent_response_system_prompt(self) -> str:
+        """Build the static system prompt for analyzing agent responses (detecting @mentions)"""
+        team_members_str = self._team_members_str
 
-Agent: {agent_name} ({agent_id})
+        prompt = f"""You are an expert at analyzing agent responses for @mentions and delegation patterns. Identify which team members are being asked to respond or contribute.
 
-Response:
-"{agent_response}"
+Analyze the agent's response (the agent is named in the message) to determine if they are ACTIVELY delegating or requesting another agent to respond.
 
-Other Team Members:
-{other_agents_str}
+Team Members:
+{team_members_str}
 
 # CRITICAL: PASSIVE vs ACTIVE MENTIONS
 
@@ -415,7 +1454,7 @@ Respond ONLY with valid JSON in this exact format:
     "confidence": 0.95
 }}
 
-Valid agent IDs: rahil, mathew, shreyas, siddarth (excluding {agent_id})
+Valid agent IDs: rahil, mathew, shreyas, siddarth (never the responding agent)
 
 # EXAMPLES
 
@@ -437,6 +1476,22 @@ Output: {{"agents": ["shreyas", "siddarth"], "is_targeted": true, "reasoning": "
 
         return prompt
 
+    def _build_agent_response_routing_prompt(
+        self,
+        agent_id: str,
+        agent_response: str
+    ) -> str:
+        """Build the per-request part of the agent response prompt (the response text)"""
+        agent_name = self._agents[agent_id]['name']
+
+        prompt = (
+            f"Agent: {agent_name} ({agent_id})\n\n"
+            "Response:\n"
+            f'"{agent_response}"'
+        )
+
+        return prompt
+
     def _parse_routing_response(self, response_text: str) -> Dict[str, Any]:
         """
         Parse LLM routing response (expects JSON)
@@ -451,32 +1506,151 @@ Output: {{"agents": ["shreyas", "siddarth"], "is_targeted": true, "reasoning": "
             IntentRouterError: If parsing fails
         """
         try:
-            # Try to extract JSON from response (in case of markdown code blocks)
-            json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', response_text, re.DOTALL)
-            if json_match:
-                json_str = json_match.group(1)
-            else:
-                # Try to find JSON object directly
-                json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-                if json_match:
-                    json_str = json_match.group(0)
-                else:
+            data = None
+            stripped = response_text.strip()
+
+            # Fast path: the response is just the JSON object (no regex, no slicing)
+            if stripped.startswith('{') and '```' not in stripped:
+                try:
+                    data = _json_loads(stripped)
+                except ValueError:
+                    data = None
+                if not isinstance(data, dict):
+                    data = None
+
+            if data is None:
+                # JSON inside a markdown code block: decode from the first '{' after the fence
+                fence = response_text.find('```')
+                if fence >= 0:
+                    data = _raw_decode_object(response_text, response_text.find('{', fence))
+
+                if data is None:
+                    # Find the JSON object directly: decode from the first '{'
+                    data = _raw_decode_object(response_text, response_text.find('{'))
+
+                if data is None:
                     raise ValueError("No JSON object found in response")
 
-            # Parse JSON
-            data = json.loads(json_str)
+            return self._validate_routing_data(data)
 
-            # Validate required fields
-            if 'agents' not in data:
-                raise ValueError("Missing 'agents' field in routing response")
+        except Exception as e:
+            raise IntentRouterError(f"Failed to parse LLM routing response: {str(e)}\nResponse: {response_text}")
+
+    def _parse_batch_routing_response(self, response_text: str, count: int) -> List[Dict[str, Any]]:
+        """
+        Parse a batched LLM routing response (expects a JSON array, one object per message)
+
+        Args:
+            response_text: Raw LLM response
+            count: Number of messages in the batch
 
-            if not isinstance(data['agents'], list):
-                raise ValueError("'agents' field must be a list")
+        Returns:
+            Parsed routing data per message, in order
 
-            return data
+        Raises:
+            IntentRouterError: If parsing fails or the array has the wrong length
+        """
+        try:
+            start = response_text.find('[')
+            end = response_text.rfind(']')
+            if start < 0 or end < start:
+                raise ValueError("No JSON array found in response")
+            items = _json_loads(response_text[start:end + 1])
+            if not isinstance(items, list) or len(items) != count:
+                raise ValueError(f"Expected a list of {count} routing objects")
+            return [self._validate_routing_data(item) for item in items]
 
         except Exception as e:
-            raise IntentRouterError(f"Failed to parse LLM routing response: {str(e)}\nResponse: {response_text}")
+            raise IntentRouterError(f"Failed to parse batched routing response: {str(e)}\nResponse: {response_text}")
+
+    def _validate_routing_data(self, data: Any) -> Dict[str, Any]:
+        """Expand a compact routing object if needed and check its required fields"""
+        if isinstance(data, dict) and 'agents' not in data and 'a' in data:
+            data = self._expand_compact_routing(data)
+
+        # Validate required fields
+        if 'agents' not in data:
+            raise ValueError("Missing 'agents' field in routing response")
+
+        if not isinstance(data['agents'], list):
+            raise ValueError("'agents' field must be a list")
+
+        return data
+
+
+class RouteBatcher:
+    """
+    Micro-batches concurrent async user query routing calls
+
+    Queries queue up for at most ROUTE_BATCH_WINDOW seconds (or until
+    ROUTE_BATCH_SIZE are waiting) and are then routed together by
+    IntentRouter._route_batch_async. Each caller awaits its own future.
+    """
+
+    def __init__(
+        self,
+        router: IntentRouter,
+        window: float = ROUTE_BATCH_WINDOW,
+        max_batch: int = ROUTE_BATCH_SIZE
+    ):
+        """
+        Initialize the batcher
+
+        Args:
+            router: IntentRouter that routes each batch
+            window: Seconds to wait for more queries before flushing
+            max_batch: Queue size that triggers an immediate flush
+        """
+        self.router = router
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: List[Tuple[str, Optional[List[Dict[str, Any]]], Tuple[str, bytes], asyncio.Future]] = []
+        self._flush_timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()  # Strong refs so in-flight flushes aren't collected
+
+    async def submit(
+        self,
+        user_query: str,
+        conversation_history: Optional[List[Dict[str, Any]]],
+        cache_key: Tuple[str, bytes]
+    ) -> RoutingDecision:
+        """Queue a query for the next batch and wait for its decision"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((user_query, conversation_history, cache_key, future))
+
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_timer is None:
+            self._flush_timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self):
+        """Send everything queued so far as one batch"""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._route(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _route(self, batch):
+        """Route one batch and resolve each caller's future"""
+        try:
+            results = await self.router._route_batch_async([item[:3] for item in batch])
+        except Exception as e:
+            error = e if isinstance(e, IntentRouterError) else IntentRouterError(f"LLM routing failed: {str(e)}")
+            results = [error] * len(batch)
+
+        for (_, _, _, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
 
 
 class MentionParser:
@@ -485,6 +1659,136 @@ class MentionParser:
     Used as a fast pre-check before LLM routing
     """
 
+    # Combined direct-name pattern over all agents and first name -> agent IDs,
+    # built on first use (needs AGENTS)
+    _name_pattern: Optional[re.Pattern] = None
+    _name_to_ids: Optional[Dict[str, Tuple[str, ...]]] = None
+    # Lowercased @mention (first name or agent ID) -> agent IDs it refers to
+    _at_mention_to_ids: Optional[Dict[str, Tuple[str, ...]]] = None
+    # Aho-Corasick automaton over the first names (None without pyahocorasick)
+    _name_automaton = None
+    # The same name pattern compiled with RE2 (None without google-re2)
+    _name_pattern_re2 = None
+    # Any roster name/alias as a whole word, anywhere (no address context), and
+    # lowercased alias -> agent IDs; used to guard the semantic routing cache
+    _reference_pattern: Optional[re.Pattern] = None
+    _reference_to_ids: Optional[Dict[str, Tuple[str, ...]]] = None
+
+    @staticmethod
+    def _get_name_pattern() -> Tuple[re.Pattern, Dict[str, Tuple[str, ...]]]:
+        """Compile one direct-name mention pattern covering every agent, once"""
+        if MentionParser._name_pattern is None:
+            AGENTS = _get_agents()
+            name_to_ids: Dict[str, Tuple[str, ...]] = {}
+            at_mention_to_ids: Dict[str, Tuple[str, ...]] = {}
+            for agent_id, metadata in AGENTS.items():
+                first_name = metadata['name'].lower().split()[0]
+                name_to_ids[first_name] = name_to_ids.get(first_name, ()) + (agent_id,)
+                for alias in dict.fromkeys((first_name, agent_id)):
+                    at_mention_to_ids[alias] = at_mention_to_ids.get(alias, ()) + (agent_id,)
+
+            # Longest first so no name is shadowed by a shorter prefix
+            names = "|".join(sorted(name_to_ids, key=len, reverse=True))
+            # Look for patterns like "Mathew, can you..." or "Hey Mathew"; each
+            # alternative captures the name in exactly one group
+            patterns = [
+                rf'\b({names})\b[,:]',  # Name followed by comma or colon
+                rf'(?:^|\.\s+)({names})\b',  # Name at start or after period
+                rf'(?:{"|".join(_GREETINGS)})\s+({names})\b',  # Greeting + name
+            ]
+            if ahocorasick is not None:
+                automaton = ahocorasick.Automaton()
+                for name in name_to_ids:
+                    automaton.add_word(name, name)
+                automaton.make_automaton()
+                MentionParser._name_automaton = automaton
+            if re2 is not None:
+                MentionParser._name_pattern_re2 = re2.compile("|".join(patterns))
+            # Every part of each agent's full name (initials aside) and its ID
+            reference_to_ids: Dict[str, Tuple[str, ...]] = {}
+            for agent_id, metadata in AGENTS.items():
+                aliases = [word for word in _WORD_RE.findall(metadata['name'].lower()) if len(word) > 2]
+                for alias in dict.fromkeys(aliases + [agent_id.lower()]):
+                    reference_to_ids[alias] = reference_to_ids.get(alias, ()) + (agent_id,)
+            references = "|".join(sorted(reference_to_ids, key=len, reverse=True))
+            MentionParser._reference_pattern = re.compile(rf'\b(?:{references})\b')
+            MentionParser._reference_to_ids = reference_to_ids
+            MentionParser._at_mention_to_ids = at_mention_to_ids
+            MentionParser._name_to_ids = name_to_ids
+            MentionParser._name_pattern = re.compile("|".join(patterns))
+        return MentionParser._name_pattern, MentionParser._name_to_ids
+
+    @staticmethod
+    def _iter_direct_names(text_lower: str) -> Iterator[str]:
+        """
+        Yield each first name mentioned directly (without @) in lowercased text
+
+        One Aho-Corasick pass finds every name occurrence; each is then kept only
+        if its surroundings match one of the direct-name patterns: name followed by
+        a comma or colon, name at the start or after a period, or greeting + name.
+        Without pyahocorasick the compiled name pattern is used instead.
+        """
+        automaton = MentionParser._name_automaton
+        if automaton is None:
+            # Every pattern needs a name, so skip the scan outright when none appears
+            # (the common case for long agent responses)
+            if not any(name in text_lower for name in MentionParser._name_to_ids):
+                return
+            name_pattern = MentionParser._name_pattern
+            # RE2 guarantees linear-time matching on long LLM output; its \b and \s are
+            # ASCII-only, so it is only used where they agree with re (ASCII text)
+            if MentionParser._name_pattern_re2 is not None and text_lower.isascii():
+                name_pattern = MentionParser._name_pattern_re2
+            for match in name_pattern.finditer(text_lower):
+                yield match[match.lastindex]
+            return
+
+        length = len(text_lower)
+        for end, name in automaton.iter(text_lower):
+            start = end - len(name) + 1
+            after = end + 1
+            # \b after the name
+            if after < length and _is_word_char(text_lower[after]):
+                continue
+            # "Mathew, ..." / "Mathew: ..." (\b before the name)
+            if after < length and text_lower[after] in ',:' and (
+                start == 0 or not _is_word_char(text_lower[start - 1])
+            ):
+                yield name
+                continue
+            if start == 0:
+                yield name
+                continue
+            # Otherwise the name must follow whitespace preceded by a period or a greeting
+            before = start
+            while before > 0 and text_lower[before - 1].isspace():
+                before -= 1
+            if before == start or before == 0:
+                continue
+            if text_lower[before - 1] == '.' or text_lower.endswith(_GREETINGS, 0, before):
+                yield name
+
+    @staticmethod
+    def extract_at_mentions(text: str) -> Set[str]:
+        """
+        Extract only explicit @mentions (by first name or agent ID) from text
+
+        Args:
+            text: Text to analyze
+
+        Returns:
+            Set of agent IDs @mentioned
+        """
+        mentioned_agents = set()
+        if '@' in text:
+            MentionParser._get_name_pattern()
+            at_mention_to_ids = MentionParser._at_mention_to_ids
+            for mention in _AT_MENTION_RE.findall(text):
+                agent_ids = at_mention_to_ids.get(mention.lower())
+                if agent_ids:
+                    mentioned_agents.update(agent_ids)
+        return mentioned_agents
+
     @staticmethod
     def extract_mentions(text: str) -> Set[str]:
         """
@@ -496,42 +1800,48 @@ class MentionParser:
         Returns:
             Set of agent IDs mentioned
         """
-        from intent_router import _get_agents
-        AGENTS = _get_agents()
-
-        mentioned_agents = set()
+        # Check for @mentions (by first name or agent ID, matched case-insensitively)
+        mentioned_agents = MentionParser.extract_at_mentions(text)
         text_lower = text.lower()
+        _, name_to_ids = MentionParser._get_name_pattern()
 
-        # Check for @mentions
-        at_mentions = re.findall(r'@(\w+)', text)
-        for mention in at_mentions:
-            mention_lower = mention.lower()
-            for agent_id in AGENTS.keys():
-                agent_name = AGENTS[agent_id]['name']
-                first_name = agent_name.split()[0].lower()
-                if mention_lower == first_name or mention_lower == agent_id:
-                    mentioned_agents.add(agent_id)
-
-        # Check for direct name mentions (without @)
-        for agent_id, metadata in AGENTS.items():
-            full_name = metadata['name'].lower()
-            first_name = full_name.split()[0]
-
-            # Look for patterns like "Mathew, can you..." or "Hey Mathew"
-            patterns = [
-                rf'\b{first_name}\b[,:]',  # Name followed by comma or colon
-                rf'(?:^|\.\s+){first_name}\b',  # Name at start or after period
-                rf'(?:hey|hi|yo)\s+{first_name}\b',  # Greeting + name
-            ]
-
-            for pattern in patterns:
-                if re.search(pattern, text_lower):
-                    mentioned_agents.add(agent_id)
-                    break
+        # Check for direct name mentions (without @): one scan for all agents
+        for name in MentionParser._iter_direct_names(text_lower):
+            mentioned_agents.update(name_to_ids[name])
 
         return mentioned_agents
 
+    @staticmethod
+    def extract_name_references(text: str) -> Set[str]:
+        """
+        Extract every agent referred to by name anywhere in text
+
+        Unlike extract_mentions, no address context is required: "What is
+        Mathew's experience?" or "how does rahil approach ML" count too.
+
+        Args:
+            text: Text to analyze
+
+        Returns:
+            Set of agent IDs named (by any part of their name or their ID)
+        """
+        MentionParser._get_name_pattern()
+        reference_to_ids = MentionParser._reference_to_ids
+        referenced = set()
+        for match in MentionParser._reference_pattern.finditer(text.lower()):
+            referenced.update(reference_to_ids[match[0]])
+        return referenced
+
     @staticmethod
     def has_mentions(text: str) -> bool:
-        """Quick check if text contains any mentions"""
-        return bool(MentionParser.extract_mentions(text))
+        """
+        Quick check if text contains any mentions
+
+        Stops at the first mention found instead of collecting all of them.
+        """
+        if MentionParser.extract_at_mentions(text):
+            return True
+        MentionParser._get_name_pattern()
+        for _ in MentionParser._iter_direct_names(text.lower()):
+            return True
+        return False
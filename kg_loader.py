@@ -2,10 +2,54 @@
 Knowledge Graph Loader
 Loads and merges JSON knowledge graphs for all team members
 """
+import hashlib
 import json
 import os
-from typing import Dict, List, Any, Tuple
+import pickle
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from typing import Dict, List, Any, Optional, Tuple
 import networkx as nx
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# get_person_context sections by node type: (context key, ((output field, node property), ...)).
+# Every entry also gets the node's 'id' and 'name' (its label)
+_CONTEXT_SECTIONS = {
+    'skill': ('skills', (('category', 'category'), ('proficiency', 'proficiencyLevel'))),
+    'technology': ('technologies', (('category', 'category'),)),
+    'project': ('projects', (('description', 'description'), ('impact', 'impact'), ('technologies', 'technologies'))),
+    'company': ('companies', (('industry', 'industry'),)),
+    'achievement': ('achievements', (('metric', 'metric'), ('impact', 'impact'))),
+    'education': ('education', (('degree', 'degree'), ('gpa', 'gpa'))),
+}
+# Sections get_person_context limits to max_items
+_CAPPED_SECTIONS = frozenset(('skills', 'technologies', 'projects', 'achievements'))
+
+# Knowledge graph file per team member
+GRAPH_FILES = {
+    'mathew': 'mathew_knowledge_graph.json',
+    'rahil': 'rahil_knowledge_graph.json',
+    'shreyas': 'shreyas_knowledge_graph.json',
+    'siddarth': 'siddarth_knowledge_graph.json'
+}
+
+# On-disk cache of the built graph in data_dir (see KnowledgeGraphLoader.load_cached_graph),
+# valid while the graph files keep the size/mtime recorded in its signature
+GRAPH_CACHE_FILE = '.merged_graph.cache.pickle'
+_GRAPH_CACHE_VERSION = 1  # Bump when the cached layout or the build logic changes
+
+
+def _read_graph_file(filepath: str) -> Dict:
+    """Read a knowledge graph file in one shot and parse the bytes (orjson if available)"""
+    with open(filepath, 'rb') as f:
+        raw = f.read()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
 
 
 class KnowledgeGraphLoader:
@@ -17,30 +61,54 @@ class KnowledgeGraphLoader:
         self.merged_graph = nx.DiGraph()
         self.node_data = {}
         self.edge_data = {}
+        # Node ID lists by person/type/category and each person's central node,
+        # built with the merged graph so lookups are dict reads instead of scans
+        self._nodes_by_person: Dict[str, List[str]] = {}
+        self._nodes_by_type: Dict[str, List[str]] = {}
+        self._nodes_by_category: Dict[str, List[str]] = {}
+        self._person_central_nodes: Dict[str, str] = {}
+        # node -> its undirected neighbors (successors + predecessors), for get_connected_nodes
+        self._neighbors: Dict[str, Tuple[str, ...]] = {}
+        # person -> context key -> shaped entries, pre-bucketed for get_person_context
+        self._person_context_sections: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+        # Lowercased node labels (node_data order) as one NumPy string array, so
+        # search_nodes matches every label in C instead of a Python loop
+        self._search_node_ids: List[str] = []
+        self._search_labels: Optional[np.ndarray] = None
         
     def load_all_graphs(self) -> Dict[str, Dict]:
         """Load all knowledge graph JSON files"""
-        files = {
-            'mathew': 'mathew_knowledge_graph.json',
-            'rahil': 'rahil_knowledge_graph.json',
-            'shreyas': 'shreyas_knowledge_graph.json',
-            'siddarth': 'siddarth_knowledge_graph.json'
-        }
+        files = GRAPH_FILES
+        
+        filepaths = {person: os.path.join(self.data_dir, filename) for person, filename in files.items()}
+        existing = {person: filepath for person, filepath in filepaths.items() if os.path.exists(filepath)}
+        
+        # Read and parse the files concurrently; startup waits for the slowest one, not the sum
+        loaded = {}
+        if existing:
+            with ThreadPoolExecutor(max_workers=len(existing)) as executor:
+                loaded = dict(zip(existing, executor.map(_read_graph_file, existing.values())))
         
         for person, filename in files.items():
-            filepath = os.path.join(self.data_dir, filename)
-            if os.path.exists(filepath):
-                with open(filepath, 'r') as f:
-                    self.graphs[person] = json.load(f)
+            if person in loaded:
+                self.graphs[person] = loaded[person]
                 print(f"Loaded {filename}: {len(self.graphs[person].get('nodes', []))} nodes, "
                       f"{len(self.graphs[person].get('edges', []))} edges")
             else:
-                print(f"Warning: {filepath} not found")
+                print(f"Warning: {filepaths[person]} not found")
         
         return self.graphs
     
     def build_merged_graph(self) -> nx.DiGraph:
-        """Build a unified NetworkX graph from all loaded graphs"""
+        """
+        Build a unified NetworkX graph from all loaded graphs
+
+        The merged graph is frozen once built: consumers (highlighter edge index,
+        analytics CSR caches) index it at construction time and rely on it not changing.
+        """
+        if nx.is_frozen(self.merged_graph):
+            return self.merged_graph
+        
         if not self.graphs:
             self.load_all_graphs()
         
@@ -51,9 +119,72 @@ class KnowledgeGraphLoader:
         
         print(f"Merged graph: {self.merged_graph.number_of_nodes()} nodes, "
               f"{self.merged_graph.number_of_edges()} edges")
+        nx.freeze(self.merged_graph)
+        self._build_node_indexes()
+        self._build_search_index()
         
         return self.merged_graph
     
+    def _source_signature(self) -> str:
+        """Digest of the graph files' names, sizes and mtimes (plus the cache version)"""
+        digest = hashlib.blake2b(str(_GRAPH_CACHE_VERSION).encode(), digest_size=16)
+        for filename in GRAPH_FILES.values():
+            try:
+                stat = os.stat(os.path.join(self.data_dir, filename))
+                digest.update(f"{filename}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+            except OSError:
+                digest.update(f"{filename}:missing;".encode())
+        return digest.hexdigest()
+    
+    def load_cached_graph(self) -> bool:
+        """
+        Restore the merged graph from the on-disk cache, skipping JSON parsing and graph building
+
+        Returns:
+            True if a cache matching the current graph files was loaded, else False
+            (nothing is changed; build the graph normally)
+        """
+        try:
+            with open(os.path.join(self.data_dir, GRAPH_CACHE_FILE), 'rb') as f:
+                cached = pickle.load(f)
+            if cached['signature'] != self._source_signature():
+                return False
+            node_data, edge_data, merged_graph = cached['node_data'], cached['edge_data'], cached['merged_graph']
+        except Exception:
+            # Missing, unreadable or stale-format cache: fall back to a normal build
+            return False
+        
+        self.node_data = node_data
+        self.edge_data = edge_data
+        self.merged_graph = merged_graph
+        nx.freeze(self.merged_graph)
+        self._build_node_indexes()
+        self._build_search_index()
+        print(f"Loaded merged graph from cache: {self.merged_graph.number_of_nodes()} nodes, "
+              f"{self.merged_graph.number_of_edges()} edges")
+        return True
+    
+    def save_cached_graph(self):
+        """Write the built merged graph to the on-disk cache (best effort: failures only warn)"""
+        cache_path = os.path.join(self.data_dir, GRAPH_CACHE_FILE)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump({
+                    'signature': self._source_signature(),
+                    'node_data': self.node_data,
+                    'edge_data': self.edge_data,
+                    'merged_graph': self.merged_graph
+                }, f, protocol=pickle.HIGHEST_PROTOCOL)
+            # Atomic swap so a concurrent reader never sees a partial file
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            print(f"Warning: could not write graph cache {cache_path}: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+    
     def _add_nodes_from_graph(self, person: str, graph_data: Dict):
         """Add nodes from a single person's graph"""
         nodes = graph_data.get('nodes', [])
@@ -63,8 +194,9 @@ class KnowledgeGraphLoader:
             node_type = node['type']
             properties = node.get('properties', {})
             
-            # Determine node label
+            # Determine node label and category
             label = properties.get('name', node_id)
+            category = self._get_node_category(node_type, properties)
             
             # Add node with enriched attributes
             self.merged_graph.add_node(
@@ -73,7 +205,7 @@ class KnowledgeGraphLoader:
                 type=node_type,
                 person=person,
                 properties=properties,
-                category=self._get_node_category(node_type, properties)
+                category=category
             )
             
             # Store in node_data for quick access
@@ -83,7 +215,7 @@ class KnowledgeGraphLoader:
                 'type': node_type,
                 'person': person,
                 'properties': properties,
-                'category': self._get_node_category(node_type, properties)
+                'category': category
             }
     
     def _add_edges_from_graph(self, person: str, graph_data: Dict):
@@ -127,52 +259,84 @@ class KnowledgeGraphLoader:
         else:
             return node_type.capitalize()
     
+    def _build_node_indexes(self):
+        """
+        Index each node's undirected neighbors and node IDs by person, type and
+        category (node_data order), find each person's central node and
+        pre-bucket each person's context entries
+        """
+        by_person = defaultdict(list)
+        by_type = defaultdict(list)
+        by_category = defaultdict(list)
+        central_nodes = {}
+        context_sections = {}
+        self._neighbors = {
+            node: tuple(dict.fromkeys(chain(self.merged_graph.successors(node), self.merged_graph.predecessors(node))))
+            for node in self.merged_graph
+        }
+        for node_id, data in self.node_data.items():
+            person = data.get('person')
+            node_type = data.get('type')
+            by_person[person].append(node_id)
+            by_type[node_type].append(node_id)
+            by_category[data.get('category')].append(node_id)
+            if node_type == 'person':
+                central_nodes.setdefault(person, node_id)
+            
+            # Shape the node's get_person_context entry once, here
+            section = _CONTEXT_SECTIONS.get(node_type)
+            if section is not None:
+                key, fields = section
+                properties = data.get('properties', {})
+                entry = {'id': node_id, 'name': data.get('label')}
+                for field, prop in fields:
+                    entry[field] = properties.get(prop)
+                sections = context_sections.get(person)
+                if sections is None:
+                    sections = context_sections[person] = {k: [] for k, _ in _CONTEXT_SECTIONS.values()}
+                sections[key].append(entry)
+        self._nodes_by_person = dict(by_person)
+        self._nodes_by_type = dict(by_type)
+        self._nodes_by_category = dict(by_category)
+        self._person_central_nodes = central_nodes
+        self._person_context_sections = context_sections
+    
     def get_nodes_by_person(self, person: str) -> List[str]:
         """Get all node IDs associated with a person"""
-        return [
-            node_id for node_id, data in self.node_data.items()
-            if data.get('person') == person
-        ]
+        return list(self._nodes_by_person.get(person, ()))
     
     def get_nodes_by_type(self, node_type: str) -> List[str]:
         """Get all node IDs of a specific type"""
-        return [
-            node_id for node_id, data in self.node_data.items()
-            if data.get('type') == node_type
-        ]
+        return list(self._nodes_by_type.get(node_type, ()))
     
     def get_nodes_by_category(self, category: str) -> List[str]:
         """Get all node IDs in a specific category"""
-        return [
-            node_id for node_id, data in self.node_data.items()
-            if data.get('category') == category
-        ]
+        return list(self._nodes_by_category.get(category, ()))
     
     def get_person_central_node(self, person: str) -> str:
         """Get the main person node ID for a given person"""
-        for node_id, data in self.node_data.items():
-            if data.get('type') == 'person' and data.get('person') == person:
-                return node_id
-        return None
+        return self._person_central_nodes.get(person)
     
     def get_connected_nodes(self, node_id: str, depth: int = 1) -> List[str]:
         """Get all nodes connected to a given node up to specified depth"""
-        if node_id not in self.merged_graph:
+        neighbors = self._neighbors
+        if node_id not in neighbors:
             return []
         
-        connected = set([node_id])
-        current_level = set([node_id])
-        
+        # Level-by-level BFS over the precomputed undirected adjacency, expanding
+        # only nodes not seen at an earlier level
+        connected = {node_id}
+        frontier = [node_id]
         for _ in range(depth):
-            next_level = set()
-            for node in current_level:
-                # Get successors (outgoing edges)
-                next_level.update(self.merged_graph.successors(node))
-                # Get predecessors (incoming edges)
-                next_level.update(self.merged_graph.predecessors(node))
-            
-            connected.update(next_level)
-            current_level = next_level
+            next_frontier = []
+            for node in frontier:
+                for neighbor in neighbors[node]:
+                    if neighbor not in connected:
+                        connected.add(neighbor)
+                        next_frontier.append(neighbor)
+            if not next_frontier:
+                break
+            frontier = next_frontier
         
         return list(connected)
     
@@ -180,108 +344,55 @@ class KnowledgeGraphLoader:
         """Get full details for a node"""
         return self.node_data.get(node_id, {})
     
+    def _build_search_index(self):
+        """Snapshot node IDs and lowercased labels for search_nodes"""
+        self._search_node_ids = list(self.node_data)
+        self._search_labels = np.array(
+            [data.get('label', '').lower() for data in self.node_data.values()], dtype=str
+        )
+    
     def search_nodes(self, query: str, limit: int = 20) -> List[Tuple[str, float]]:
         """
         Search nodes by name/label.
         Returns list of (node_id, relevance_score) tuples.
         """
+        # Rebuild the label array if nodes were added since it was built
+        if self._search_labels is None or len(self._search_node_ids) != len(self.node_data):
+            self._build_search_index()
+        labels = self._search_labels
         query_lower = query.lower()
-        results = []
         
-        for node_id, data in self.node_data.items():
-            label = data.get('label', '').lower()
-            
-            # Simple relevance scoring
-            if query_lower == label:
-                score = 1.0
-            elif query_lower in label:
-                score = 0.8
-            elif any(word in label for word in query_lower.split()):
-                score = 0.5
-            else:
-                continue
-            
-            results.append((node_id, score))
+        # Simple relevance scoring, evaluated for all labels at once
+        any_word = np.zeros(len(labels), dtype=bool)
+        for word in query_lower.split():
+            any_word |= np.char.find(labels, word) >= 0
+        scores = np.select(
+            [labels == query_lower, np.char.find(labels, query_lower) >= 0, any_word],
+            [1.0, 0.8, 0.5],
+            default=0.0
+        )
         
-        # Sort by relevance
-        results.sort(key=lambda x: x[1], reverse=True)
-        return results[:limit]
+        # Sort by relevance (stable, so equal scores keep node order)
+        matches = np.flatnonzero(scores)
+        top = matches[np.argsort(-scores[matches], kind='stable')][:limit]
+        return [(self._search_node_ids[i], float(scores[i])) for i in top]
     
     def get_person_context(self, person: str, max_items: int = 50) -> Dict[str, Any]:
         """
         Get relevant context for a person for agent grounding.
         Returns a structured summary of their skills, projects, technologies.
+        Entries are shaped once when the graph is built and shared between
+        calls, so treat them as read-only.
         """
-        person_nodes = self.get_nodes_by_person(person)
-        person_node_id = self.get_person_central_node(person)
-        
+        sections = self._person_context_sections.get(person, {})
         context = {
             'person': person,
-            'person_node_id': person_node_id,
-            'skills': [],
-            'technologies': [],
-            'projects': [],
-            'companies': [],
-            'achievements': [],
-            'education': []
+            'person_node_id': self.get_person_central_node(person)
         }
-        
-        for node_id in person_nodes:
-            node = self.node_data.get(node_id, {})
-            node_type = node.get('type')
-            properties = node.get('properties', {})
-            
-            if node_type == 'skill':
-                context['skills'].append({
-                    'id': node_id,
-                    'name': node.get('label'),
-                    'category': properties.get('category'),
-                    'proficiency': properties.get('proficiencyLevel')
-                })
-            
-            elif node_type == 'technology':
-                context['technologies'].append({
-                    'id': node_id,
-                    'name': node.get('label'),
-                    'category': properties.get('category')
-                })
-            
-            elif node_type == 'project':
-                context['projects'].append({
-                    'id': node_id,
-                    'name': node.get('label'),
-                    'description': properties.get('description'),
-                    'impact': properties.get('impact'),
-                    'technologies': properties.get('technologies')
-                })
-            
-            elif node_type == 'company':
-                context['companies'].append({
-                    'id': node_id,
-                    'name': node.get('label'),
-                    'industry': properties.get('industry')
-                })
-            
-            elif node_type == 'achievement':
-                context['achievements'].append({
-                    'id': node_id,
-                    'name': node.get('label'),
-                    'metric': properties.get('metric'),
-                    'impact': properties.get('impact')
-                })
-            
-            elif node_type == 'education':
-                context['education'].append({
-                    'id': node_id,
-                    'name': node.get('label'),
-                    'degree': properties.get('degree'),
-                    'gpa': properties.get('gpa')
-                })
-        
-        # Limit items to avoid overwhelming the agent
-        for key in ['skills', 'technologies', 'projects', 'achievements']:
-            if len(context[key]) > max_items:
-                context[key] = context[key][:max_items]
+        for key, _ in _CONTEXT_SECTIONS.values():
+            entries = sections.get(key, [])
+            # Limit items to avoid overwhelming the agent
+            context[key] = entries[:max_items] if key in _CAPPED_SECTIONS else list(entries)
         
         return context
     
@@ -290,29 +401,14 @@ class KnowledgeGraphLoader:
         return [(node_id, data.get('label', '')) for node_id, data in self.node_data.items()]
     
     def get_statistics(self) -> Dict[str, Any]:
-        """Get statistics about the knowledge graph"""
-        stats = {
+        """Get statistics about the knowledge graph (counted from the node indexes, no node scan)"""
+        return {
             'total_nodes': len(self.node_data),
             'total_edges': len(self.edge_data),
-            'nodes_by_type': {},
-            'nodes_by_person': {},
-            'nodes_by_category': {}
+            'nodes_by_type': {node_type: len(ids) for node_type, ids in self._nodes_by_type.items()},
+            'nodes_by_person': {person: len(ids) for person, ids in self._nodes_by_person.items()},
+            'nodes_by_category': {category: len(ids) for category, ids in self._nodes_by_category.items()}
         }
-        
-        for node_id, data in self.node_data.items():
-            # Count by type
-            node_type = data.get('type', 'unknown')
-            stats['nodes_by_type'][node_type] = stats['nodes_by_type'].get(node_type, 0) + 1
-            
-            # Count by person
-            person = data.get('person', 'unknown')
-            stats['nodes_by_person'][person] = stats['nodes_by_person'].get(person, 0) + 1
-            
-            # Count by category
-            category = data.get('category', 'unknown')
-            stats['nodes_by_category'][category] = stats['nodes_by_category'].get(category, 0) + 1
-        
-        return stats
 
 
 # Singleton instance
@@ -323,7 +419,9 @@ def get_kg_loader(data_dir: str = "data/knowledgeGraphs") -> KnowledgeGraphLoade
     global _kg_loader
     if _kg_loader is None:
         _kg_loader = KnowledgeGraphLoader(data_dir)
-        _kg_loader.load_all_graphs()
-        _kg_loader.build_merged_graph()
+        if not _kg_loader.load_cached_graph():
+            _kg_loader.load_all_graphs()
+            _kg_loader.build_merged_graph()
+            _kg_loader.save_cached_graph()
     return _kg_loader
 
@@ -5,7 +5,7 @@ Handles real-time communication between React frontend and Python backend
 """
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 import asyncio
 import json
 from typing import Dict, List, Any
@@ -112,6 +112,7 @@ print("Graph analytics ready!")
 # Pre-generate and cache cytoscape elements (performance optimization)
 print("Pre-generating cytoscape elements...")
 cached_cytoscape_elements = graph_view.generate_cytoscape_elements()
+cached_graph_payload_json = graph_view.generate_graph_payload_json(cached_cytoscape_elements)
 print(f"Cytoscape cache ready! ({len([e for e in cached_cytoscape_elements if 'label' in e.get('data', {})])} nodes, {len([e for e in cached_cytoscape_elements if 'source' in e.get('data', {})])} edges)")
 
 # Active WebSocket connections
@@ -352,12 +353,8 @@ async def health_check():
 
 @app.get("/api/graph")
 async def get_graph_data():
-    """Get knowledge graph data (using cached elements for performance)"""
-    return {
-        "nodes": len(kg_loader.node_data),
-        "edges": kg_loader.merged_graph.number_of_edges(),
-        "elements": cached_cytoscape_elements
-    }
+    """Get knowledge graph data (using the pre-serialized payload for performance)"""
+    return Response(content=cached_graph_payload_json, media_type="application/json")
 
 
 @app.get("/api/agents")
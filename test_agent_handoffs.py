@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""Test MultiAgentSystem.group_chat_mode_async (speculation, agent handoffs) with stub clients"""
+
+import asyncio
+import json
+import threading
+
+import pytest
+
+import intent_router
+from agents import AGENTS, MultiAgentSystem
+from intent_router import IntentRouter
+
+# First reply per agent; later agents just answer
+REPLIES = {
+    "rahil": "Great point. What do you think, Mathew?",
+    "siddarth": "I think Shreyas should weigh in here",
+}
+
+
+class StubAgentClient:
+    use_gpt5 = False
+    model = "stub"
+
+    def __init__(self, agent_id):
+        self.agent_id = agent_id
+        self.calls = 0
+        self.cancelled = 0
+
+    async def generate_async(self, messages, response_format=None):
+        self.calls += 1
+        try:
+            await asyncio.sleep(0.1)  # Outlasts the router batch window
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return REPLIES.get(self.agent_id, f"{self.agent_id} answers")
+
+
+class StubAgent:
+    def __init__(self, agent_id):
+        self.agent_id = agent_id
+        self.metadata = AGENTS[agent_id]
+        self.openai_client = StubAgentClient(agent_id)
+
+    def build_messages(self, user_query, conversation_history, mode="group", routing_context=None):
+        return [{"role": "user", "content": f"{user_query}|{len(conversation_history)}|{routing_context}"}]
+
+    async def respond_async(self, user_query, conversation_history, mode="group", routing_context=None):
+        messages = self.build_messages(user_query, conversation_history, mode, routing_context)
+        return await self.openai_client.generate_async(messages)
+
+
+class StubRouterClient:
+    """Routes the user query to one agent, then hands off to whoever the reply addresses"""
+
+    model = "stub-router"
+
+    def __init__(self, first_agent):
+        self.first_agent = first_agent
+        self.agent_response_calls = 0
+
+    async def generate_async(self, messages, response_format=None):
+        prompt = messages[-1]["content"]
+        if "Great point" in prompt:
+            self.agent_response_calls += 1
+            return json.dumps({"agents": ["mathew"], "reasoning": "asked Mathew", "confidence": 0.9})
+        if "should weigh in" in prompt:
+            self.agent_response_calls += 1
+            return json.dumps({"agents": ["shreyas"], "reasoning": "delegated", "confidence": 0.9})
+        return json.dumps({"agents": [self.first_agent], "reasoning": "stub", "is_targeted": False,
+                           "confidence": 0.9, "intent": "expertise_match"})
+
+
+@pytest.fixture(autouse=True)
+def no_embeddings(monkeypatch):
+    monkeypatch.setattr(intent_router, "get_embedding", lambda text: None)
+    monkeypatch.setattr(intent_router, "get_embeddings", lambda texts: [None] * len(texts))
+
+
+def make_system(router_client):
+    """A MultiAgentSystem wired to stubs (no API keys, knowledge graph or web search)"""
+    system = MultiAgentSystem.__new__(MultiAgentSystem)
+    system.agents = {agent_id: StubAgent(agent_id) for agent_id in AGENTS}
+    system.router_client = router_client
+    system.intent_router = IntentRouter(router_client)
+    system.max_agent_to_agent_rounds = 2
+    system.log_buffer = []
+    system._log_lock = threading.Lock()
+    return system
+
+
+@pytest.mark.parametrize("first_agent, handed_off_to", [
+    ("rahil", "mathew"),  # Question addressed by name, no @mention
+    ("siddarth", "shreyas"),  # Delegation language
+])
+def test_reply_without_mention_hands_off(first_agent, handed_off_to):
+    router_client = StubRouterClient(first_agent)
+    system = make_system(router_client)
+
+    responses = asyncio.run(system.group_chat_mode_async("How should we design our data pipelines?"))
+
+    assert [agent_id for agent_id, _ in responses] == [first_agent, handed_off_to]
+    assert router_client.agent_response_calls == 1
+
+
+def test_reply_without_handoff_skips_the_llm():
+    router_client = StubRouterClient("shreyas")
+    system = make_system(router_client)
+
+    responses = asyncio.run(system.group_chat_mode_async("How should we design our data pipelines?"))
+
+    assert [agent_id for agent_id, _ in responses] == ["shreyas"]
+    assert router_client.agent_response_calls == 0
+
+
+QUERY = "How should we scale our AWS data pipelines with Python?"
+
+
+def agent_calls(system):
+    return {agent_id: agent.openai_client.calls for agent_id, agent in system.agents.items()
+            if agent.openai_client.calls}
+
+
+def test_speculative_answer_is_reused_for_the_routed_agent():
+    guess = IntentRouter(object())._agent_prior(QUERY)[0]
+    system = make_system(StubRouterClient(guess))
+
+    responses = asyncio.run(system.group_chat_mode_async(QUERY))
+
+    assert [agent_id for agent_id, _ in responses] == [guess]
+    assert agent_calls(system) == {guess: 1}  # One call: the speculative one, reused
+
+
+def test_speculation_is_limited_to_one_agent_and_discarded_when_misrouted():
+    guess = IntentRouter(object())._agent_prior(QUERY)[0]
+    routed = next(agent_id for agent_id in ("shreyas", "mathew") if agent_id != guess)
+    system = make_system(StubRouterClient(routed))
+
+    responses = asyncio.run(system.group_chat_mode_async(QUERY))
+
+    assert [agent_id for agent_id, _ in responses] == [routed]
+    assert agent_calls(system) == {guess: 1, routed: 1}
+    assert system.agents[guess].openai_client.cancelled == 1
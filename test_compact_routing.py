@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""Test decoding of the compact user query routing output ({"a": mask, "t", "c", "i"})"""
+
+import pytest
+
+from intent_router import IntentRouter, IntentRouterError
+
+
+class NoLLMClient:
+    """Routing responses are parsed directly; the LLM is never called"""
+
+
+@pytest.fixture
+def router():
+    return IntentRouter(NoLLMClient())
+
+
+def test_mask_order_matches_prompt(router):
+    assert router._agent_order == ("rahil", "mathew", "shreyas", "siddarth")
+    assert "in this order: rahil, mathew, shreyas, siddarth" in router._user_query_system_prompt
+
+
+@pytest.mark.parametrize("response_text, agent_ids", [
+    ('{"a": "x---", "t": 0, "c": 0.9, "i": "g"}', ["rahil"]),
+    ('{"a": "-x--", "t": 1, "c": 0.9, "i": "m"}', ["mathew"]),
+    ('{"a": "--x-", "t": 0, "c": 0.8, "i": "e"}', ["shreyas"]),
+    ('{"a": "---x", "t": 0, "c": 0.8, "i": "e"}', ["siddarth"]),
+    ('{"a": "-x-x", "t": 0, "c": 0.7, "i": "e"}', ["mathew", "siddarth"]),
+    ('{"a": "xxxx", "t": 1, "c": 1.0, "i": "t"}', ["rahil", "mathew", "shreyas", "siddarth"]),
+])
+def test_mask_decodes_to_agent_ids(router, response_text, agent_ids):
+    routing_data = router._parse_routing_response(response_text)
+
+    assert routing_data["agents"] == agent_ids
+
+
+def test_compact_fields_expand(router):
+    routing_data = router._parse_routing_response('{"a": "-x--", "t": 1, "c": 0.95, "i": "m"}')
+
+    assert routing_data["is_targeted"] is True
+    assert routing_data["confidence"] == 0.95
+    assert routing_data["intent"] == "explicit_mention"
+    assert routing_data["reasoning"]
+
+
+def test_mask_of_wrong_length_is_rejected(router):
+    with pytest.raises(IntentRouterError):
+        router._parse_routing_response('{"a": "x--", "t": 0, "c": 0.9, "i": "e"}')
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Test the on-disk merged knowledge graph cache (load_cached_graph / save_cached_graph)"""
+
+import os
+import shutil
+
+import networkx as nx
+import pytest
+
+import kg_loader
+from kg_loader import GRAPH_CACHE_FILE, GRAPH_FILES, KnowledgeGraphLoader
+
+SOURCE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "knowledgeGraphs")
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    """A private copy of the knowledge graph files, so the cache is written there"""
+    for filename in GRAPH_FILES.values():
+        shutil.copy2(os.path.join(SOURCE_DIR, filename), tmp_path / filename)
+    return str(tmp_path)
+
+
+def build_cold(data_dir):
+    loader = KnowledgeGraphLoader(data_dir)
+    loader.load_all_graphs()
+    loader.build_merged_graph()
+    return loader
+
+
+def build_and_save(data_dir):
+    loader = build_cold(data_dir)
+    loader.save_cached_graph()
+    return loader
+
+
+def test_warm_load_equals_cold_build(data_dir):
+    cold = build_and_save(data_dir)
+
+    warm = KnowledgeGraphLoader(data_dir)
+    assert warm.load_cached_graph()
+
+    assert nx.is_frozen(warm.merged_graph)
+    assert warm.node_data == cold.node_data
+    assert warm.edge_data == cold.edge_data
+    assert list(warm.merged_graph.nodes(data=True)) == list(cold.merged_graph.nodes(data=True))
+    assert list(warm.merged_graph.edges(data=True)) == list(cold.merged_graph.edges(data=True))
+    assert warm.get_statistics() == cold.get_statistics()
+    assert warm.search_nodes("python") == cold.search_nodes("python")
+    person = next(iter(GRAPH_FILES))
+    assert warm.get_person_context(person) == cold.get_person_context(person)
+
+
+def test_touching_a_source_file_invalidates_the_cache(data_dir):
+    build_and_save(data_dir)
+    path = os.path.join(data_dir, GRAPH_FILES["rahil"])
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert not KnowledgeGraphLoader(data_dir).load_cached_graph()
+
+
+def test_resizing_a_source_file_invalidates_the_cache(data_dir):
+    build_and_save(data_dir)
+    path = os.path.join(data_dir, GRAPH_FILES["mathew"])
+    stat = os.stat(path)
+    with open(path, "a") as f:
+        f.write("\n")  # Still valid JSON, one byte longer
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))  # Same mtime: only the size differs
+
+    assert not KnowledgeGraphLoader(data_dir).load_cached_graph()
+
+
+def test_corrupt_cache_falls_back_to_rebuild(data_dir, monkeypatch):
+    cold = build_and_save(data_dir)
+    with open(os.path.join(data_dir, GRAPH_CACHE_FILE), "wb") as f:
+        f.write(b"not a pickle")
+
+    assert not KnowledgeGraphLoader(data_dir).load_cached_graph()
+
+    # get_kg_loader rebuilds from the JSON files and rewrites a valid cache
+    monkeypatch.setattr(kg_loader, "_kg_loader", None)
+    rebuilt = kg_loader.get_kg_loader(data_dir)
+    assert rebuilt.node_data == cold.node_data
+    assert KnowledgeGraphLoader(data_dir).load_cached_graph()
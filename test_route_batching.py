@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Test micro-batched async user query routing (RouteBatcher) with a stub LLM client"""
+
+import asyncio
+import json
+
+import pytest
+
+import intent_router
+from intent_router import IntentRouter, IntentRouterError
+
+QUERIES = [
+    "How should we design our data pipelines?",
+    "What do you think about our cloud costs?",
+    "Any thoughts on improving model accuracy?",
+]
+
+
+class StubClient:
+    """Records each generate_async call and answers with a canned response"""
+
+    def __init__(self, respond):
+        self.respond = respond
+        self.calls = []
+
+    async def generate_async(self, messages, response_format=None):
+        self.calls.append(messages)
+        await asyncio.sleep(0)
+        return self.respond(messages)
+
+
+def routing_object(agent_id):
+    return {"agents": [agent_id], "reasoning": "stub", "is_targeted": False,
+            "confidence": 0.9, "intent": "expertise_match"}
+
+
+@pytest.fixture(autouse=True)
+def no_embeddings(monkeypatch):
+    """Skip the embeddings API; the semantic cache is simply unused"""
+    monkeypatch.setattr(intent_router, "get_embedding", lambda text: None)
+    monkeypatch.setattr(intent_router, "get_embeddings", lambda texts: [None] * len(texts))
+
+
+async def route_concurrently(router, queries):
+    return await asyncio.gather(
+        *(router.route_user_query_async(query, []) for query in queries),
+        return_exceptions=True
+    )
+
+
+def test_concurrent_queries_share_one_llm_call():
+    client = StubClient(lambda messages: json.dumps([routing_object("mathew")] * len(QUERIES)))
+    router = IntentRouter(client)
+
+    decisions = asyncio.run(route_concurrently(router, QUERIES))
+
+    assert len(client.calls) == 1
+    assert [d.agent_ids for d in decisions] == [["mathew"]] * len(QUERIES)
+
+
+def test_wrong_length_batch_response_falls_back_to_one_call_per_query():
+    def respond(messages):
+        # The batched call gets an array that is one object short
+        if len(client.calls) == 1:
+            return json.dumps([routing_object("rahil")] * (len(QUERIES) - 1))
+        return json.dumps(routing_object("siddarth"))
+
+    client = StubClient(respond)
+    router = IntentRouter(client)
+
+    decisions = asyncio.run(route_concurrently(router, QUERIES))
+
+    assert len(client.calls) == 1 + len(QUERIES)
+    assert [d.agent_ids for d in decisions] == [["siddarth"]] * len(QUERIES)
+
+
+def test_failing_llm_call_raises_for_every_waiter():
+    def respond(messages):
+        raise RuntimeError("service unavailable")
+
+    router = IntentRouter(StubClient(respond))
+
+    results = asyncio.run(route_concurrently(router, QUERIES))
+
+    assert len(results) == len(QUERIES)
+    assert all(isinstance(result, IntentRouterError) for result in results)
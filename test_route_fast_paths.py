@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""Test which user queries IntentRouter routes without an LLM call (_route_unambiguous)"""
+
+import pytest
+
+from intent_router import IntentRouter
+
+ALL_AGENTS = ["rahil", "mathew", "shreyas", "siddarth"]
+
+
+class NoLLMClient:
+    """Fast paths never call the LLM"""
+
+
+@pytest.fixture(scope="module")
+def router():
+    return IntentRouter(NoLLMClient())
+
+
+@pytest.mark.parametrize("user_query, agent_ids, intent", [
+    ("@shreyas and @rahil thoughts?", ["rahil", "shreyas"], "explicit_mention"),
+    ("Hi Mathew", ["mathew"], "explicit_mention"),
+    ("Rahil, can you explain RAG?", ["rahil"], "explicit_mention"),
+    ("I'd like to hear from everyone on this", ALL_AGENTS, "team_activation"),
+    ("All of you, what do you think?", ALL_AGENTS, "team_activation"),
+    ("Bring in the team please", ALL_AGENTS, "team_activation"),
+    ("Hi everyone!", ["rahil"], "greeting"),
+])
+def test_unambiguous_queries_skip_the_llm(router, user_query, agent_ids, intent):
+    decision = router._route_unambiguous(user_query)
+
+    assert decision is not None
+    assert decision.agent_ids == agent_ids
+    assert decision.context == intent
+
+
+@pytest.mark.parametrize("user_query", [
+    "Does everyone here use Kafka?",
+    "What would everyone recommend for ETL?",
+    "Mathew's pipelines are slow, why?",
+    "rahil: what do you think of the plan, Shreyas?",
+    "Hi Mathew, how does this compare to Rahil's approach?",
+])
+def test_ambiguous_queries_go_to_the_llm(router, user_query):
+    assert router._route_unambiguous(user_query) is None
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Test the exact and semantic user query routing cache with stubbed embeddings"""
+
+import json
+import zlib
+
+import numpy as np
+import pytest
+
+import intent_router
+from intent_router import IntentRouter, _normalize_query
+
+DIMENSIONS = 8
+
+
+def unit(*components):
+    vector = np.zeros(DIMENSIONS, dtype=np.float32)
+    vector[:len(components)] = components
+    return vector / np.linalg.norm(vector)
+
+
+# Normalized query -> stub embedding; anything else gets a fixed pseudo-random vector
+EMBEDDINGS = {
+    _normalize_query("How do we scale our data pipelines?"): unit(1.0, 0.0),
+    _normalize_query("How can we scale our data pipelines?"): unit(1.0, 0.05),  # cos ~0.999
+    _normalize_query("What is Mathew's experience?"): unit(0.0, 1.0),
+    _normalize_query("What is Rahil's experience?"): unit(0.0, 1.0),
+}
+
+
+def stub_embedding(text):
+    if text in EMBEDDINGS:
+        return EMBEDDINGS[text]
+    rng = np.random.default_rng(zlib.crc32(text.encode()))
+    return rng.standard_normal(DIMENSIONS).astype(np.float32)
+
+
+class StubClient:
+    """Counts routing calls and always routes to Siddarth"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate(self, messages, stream=False, response_format=None):
+        self.calls += 1
+        yield json.dumps({"agents": ["siddarth"], "reasoning": "stub", "is_targeted": False,
+                          "confidence": 0.9, "intent": "expertise_match"})
+
+
+@pytest.fixture(autouse=True)
+def stub_embeddings(monkeypatch):
+    monkeypatch.setattr(intent_router, "get_embedding", stub_embedding)
+    monkeypatch.setattr(intent_router, "get_embeddings", lambda texts: [stub_embedding(t) for t in texts])
+
+
+@pytest.fixture
+def client():
+    return StubClient()
+
+
+@pytest.fixture
+def router(client):
+    return IntentRouter(client)
+
+
+def test_exact_hit(router, client):
+    first = router.route_user_query("How do we scale our data pipelines?", [])
+    second = router.route_user_query("  how do we scale our data pipelines? ", [])
+
+    assert client.calls == 1
+    assert second.agent_ids == first.agent_ids
+    assert second is not first  # callers get copies
+
+
+def test_semantic_hit_above_threshold(router, client):
+    router.route_user_query("How do we scale our data pipelines?", [])
+    decision = router.route_user_query("How can we scale our data pipelines?", [])
+
+    assert client.calls == 1
+    assert decision.agent_ids == ["siddarth"]
+
+
+def test_semantic_miss_when_history_differs(router, client):
+    router.route_user_query("How do we scale our data pipelines?", [])
+    router.route_user_query(
+        "How can we scale our data pipelines?",
+        [{"role": "user", "content": "We moved everything to Kafka last week"}]
+    )
+
+    assert client.calls == 2
+
+
+def test_no_embedding_request_mid_conversation(router, client, monkeypatch):
+    def fail(text):
+        raise AssertionError("embedding requested for a query with conversation context")
+
+    monkeypatch.setattr(intent_router, "get_embedding", fail)
+    history = [{"role": "user", "content": "We moved everything to Kafka last week"}]
+    router.route_user_query("How do we scale our data pipelines?", history)
+    router.route_user_query("How do we scale our data pipelines?", history)
+
+    assert client.calls == 1  # Exact hits still work without an embedding
+
+
+def test_semantic_miss_when_named_agents_differ(router, client):
+    router.route_user_query("What is Mathew's experience?", [])
+    router.route_user_query("What is Rahil's experience?", [])
+
+    assert client.calls == 2
+
+
+def test_eviction_frees_and_reuses_matrix_rows(router, client, monkeypatch):
+    monkeypatch.setattr(intent_router, "ROUTING_CACHE_SIZE", 2)
+    queries = ["Tell me about query one", "Tell me about query two", "Tell me about query three"]
+    for query in queries:
+        router.route_user_query(query, [])
+
+    # The oldest entry was evicted and its row zeroed and freed
+    evicted_key = (_normalize_query(queries[0]), b'')
+    assert evicted_key not in router._routing_cache
+    assert len(router._routing_cache) == 2
+    assert router._free_slots == [0]
+    assert not router._embed_matrix[0].any()
+
+    # The next entry reuses the freed row instead of growing the slot list (and
+    # evicts query two, freeing its row in turn)
+    router.route_user_query("Tell me about query four", [])
+    assert len(router._slot_keys) == 3
+    assert router._slot_keys[0] == (_normalize_query("Tell me about query four"), b'')
+    assert router._free_slots == [1]
+    assert client.calls == 4
+
+    # The evicted query is routed by the LLM again
+    router.route_user_query(queries[0], [])
+    assert client.calls == 5
@@ -82,13 +82,25 @@ def cosine_similarity(vec1: np.ndarray, vec2: np.ndarray) -> float:
     return dot_product / (norm1 * norm2)
 
 
+# Embedding model and shared client (created on first use, reused by every caller)
+EMBEDDING_MODEL = "text-embedding-3-small"
+_embedding_client = None
+
+
+def _get_embedding_client():
+    """Get or create the shared OpenAI client used for embeddings"""
+    global _embedding_client
+    if _embedding_client is None:
+        from openai import OpenAI
+        _embedding_client = OpenAI(api_key=get_openai_api_key())
+    return _embedding_client
+
+
 def get_embedding(text: str) -> Optional[np.ndarray]:
     """Get embedding vector for text using OpenAI API"""
     try:
-        from openai import OpenAI
-        client = OpenAI(api_key=get_openai_api_key())
-        response = client.embeddings.create(
-            model="text-embedding-3-small",
+        response = _get_embedding_client().embeddings.create(
+            model=EMBEDDING_MODEL,
             input=text
         )
         return np.array(response.data[0].embedding)
@@ -97,6 +109,32 @@ def get_embedding(text: str) -> Optional[np.ndarray]:
         return None
 
 
+def get_embeddings(texts: List[str]) -> List[Optional[np.ndarray]]:
+    """
+    Get embedding vectors for several texts with a single OpenAI API call
+
+    Args:
+        texts: Texts to embed
+
+    Returns:
+        One embedding per text, in order (all None if the request fails)
+    """
+    if not texts:
+        return []
+    try:
+        response = _get_embedding_client().embeddings.create(
+            model=EMBEDDING_MODEL,
+            input=list(texts)
+        )
+        embeddings: List[Optional[np.ndarray]] = [None] * len(texts)
+        for item in response.data:
+            embeddings[item.index] = np.array(item.embedding)
+        return embeddings
+    except Exception as e:
+        print(f"Error getting embeddings: {e}")
+        return [None] * len(texts)
+
+
 def find_relevant_nodes(
     query: str,
     node_embeddings: Dict[str, np.ndarray],